@@ -1,22 +1,1399 @@
 import os
+import stat
+import errno
 import zipfile
+import tarfile
 import shutil
-from pathlib import Path
 import sys
 from collections import defaultdict
 import subprocess
 import platform
+import time
+import queue
+import argparse
+import threading
+import json
+import re
+import zlib
+import lzma
+import sqlite3
+import hashlib
+import codecs
+import fnmatch
+from collections import deque
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-class ArchiveExtractor:
+# Discovered archives waiting for an extraction worker
+ARCHIVE_QUEUE_SIZE = 256
+
+# Buffer size used when streaming archive members to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# zipfile decrypts ZipCrypto in pure Python, so large encrypted
+# ZIPs are left to 7-Zip when it is available
+ZIPCRYPTO_INPROCESS_LIMIT = 32 * 1024 * 1024
+
+# WinZip AES entries use this compression method id
+ZIP_AES_METHOD = 99
+
+# Tar suffixes, compound ones first so '.tar.gz' wins over '.gz'
+TAR_SUFFIXES = ('.tar.gz', '.tar.bz2', '.tar.xz', '.tar.zst', '.tgz', '.tbz2', '.tbz', '.txz', '.tzst', '.tar')
+ZSTD_TAR_SUFFIXES = ('.tar.zst', '.tzst')
+
+# 7-Zip family archives smaller than this are not listed before extraction,
+# since the extra process would cost more than it tells us
+PROBE_MIN_SIZE = 64 * 1024 * 1024
+
+ZIP_METHOD_NAMES = {
+    zipfile.ZIP_STORED: 'Store',
+    zipfile.ZIP_DEFLATED: 'Deflate',
+    zipfile.ZIP_BZIP2: 'BZip2',
+    zipfile.ZIP_LZMA: 'LZMA',
+    ZIP_AES_METHOD: 'AES',
+}
+
+# Leading bytes read from each candidate file to identify its format
+SNIFF_SIZE = 4096
+
+# Header reads in flight before discovery waits for the oldest one
+SNIFF_WINDOW = 256
+
+# Formats each engine can take on
+ZIPFILE_FORMATS = {'zip'}
+TARFILE_FORMATS = {'tar', 'tar.gz', 'tar.xz', 'bz2', 'zst'}
+
+def is_tar_header(block):
+    """Check for a ustar magic or a valid v7 tar header checksum"""
+    if len(block) < 512:
+        return False
+    if block[257:262] == b'ustar':
+        return True
+    try:
+        checksum = int(block[148:156].split(b'\0', 1)[0].strip() or b'-1', 8)
+    except ValueError:
+        return False
+    return checksum == sum(block[:148]) + 8 * 32 + sum(block[156:512])
+
+def detect_format(head):
+    """Identify an archive format from its leading bytes (None if not an archive)"""
+    if head[:4] in (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08'):
+        return 'zip'
+    if head.startswith(b'Rar!\x1a\x07'):
+        return 'rar'
+    if head.startswith(b'7z\xbc\xaf\x27\x1c'):
+        return '7z'
+    if head.startswith(b'\x1f\x8b'):
+        # gzip and xz decode incrementally, so the first tar block can be peeked at
+        try:
+            inner = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(head, 512)
+        except zlib.error:
+            inner = b''
+        return 'tar.gz' if is_tar_header(inner) else 'gz'
+    if head.startswith(b'\xfd7zXZ\x00'):
+        try:
+            inner = lzma.LZMADecompressor(format=lzma.FORMAT_XZ).decompress(head, 512)
+        except lzma.LZMAError:
+            inner = b''
+        return 'tar.xz' if is_tar_header(inner) else 'xz'
+    # bzip2 and zstd frames can't be peeked into from a few KB
+    if head.startswith(b'BZh') and head[3:4].isdigit():
+        return 'bz2'
+    if head.startswith(b'\x28\xb5\x2f\xfd'):
+        return 'zst'
+    if is_tar_header(head[:512]):
+        return 'tar'
+    return None
+
+def sniff_format(path):
+    """Read the start of a file and identify its archive format"""
+    try:
+        with open(path, 'rb') as f:
+            return detect_format(f.read(SNIFF_SIZE))
+    except OSError:
+        return None
+
+# 7-Zip's method id for AES-256 + SHA-256, as stored in a coder record
+SEVENZIP_AES_CODER = b'\x06\xf1\x07\x01'
+# Largest 7z header read to look for that coder
+SEVENZIP_HEADER_LIMIT = 4 * 1024 * 1024
+
+def read_vint(data, pos):
+    """Decode a RAR5 variable-length integer; returns (value, next position)"""
+    value = 0
+    shift = 0
+    while pos < len(data):
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+    raise ValueError("truncated vint")
+
+def rar_encryption(head):
+    """Read RAR encryption flags from the first headers: (headers encrypted, first file encrypted)"""
+    if head.startswith(b'Rar!\x1a\x07\x01\x00'):
+        pos = 8
+        while pos < len(head):
+            # CRC32, header size, then type and flags inside the counted size
+            size, data_start = read_vint(head, pos + 4)
+            header_end = data_start + size
+            header_type, pos = read_vint(head, data_start)
+            flags, pos = read_vint(head, pos)
+            if header_type == 4:
+                # Archive encryption header: everything after it is encrypted
+                return True, True
+            extra_size, pos = read_vint(head, pos) if flags & 0x01 else (0, pos)
+            data_size, pos = read_vint(head, pos) if flags & 0x02 else (0, pos)
+            if header_type == 2:
+                extra = head[header_end - extra_size:header_end]
+                offset = 0
+                while offset < len(extra):
+                    record_size, record_start = read_vint(extra, offset)
+                    record_type, _ = read_vint(extra, record_start)
+                    if record_type == 0x01:
+                        return False, True
+                    offset = record_start + record_size
+                return False, False
+            pos = header_end + data_size
+        return None
+    if head.startswith(b'Rar!\x1a\x07\x00'):
+        pos = 7
+        while pos + 7 <= len(head):
+            header_type = head[pos + 2]
+            flags = int.from_bytes(head[pos + 3:pos + 5], 'little')
+            size = int.from_bytes(head[pos + 5:pos + 7], 'little')
+            if header_type == 0x73 and flags & 0x0080:
+                return True, True
+            if header_type == 0x74:
+                return False, bool(flags & 0x0004)
+            add_size = int.from_bytes(head[pos + 7:pos + 11], 'little') if flags & 0x8000 else 0
+            if size < 7:
+                break
+            pos += size + add_size
+    return None
+
+def sevenzip_encryption(f):
+    """Look for the AES coder in a 7z archive's end header: (headers encrypted, data encrypted)"""
+    start = f.read(32)
+    if len(start) < 32 or not start.startswith(b'7z\xbc\xaf\x27\x1c'):
+        return None
+    offset = int.from_bytes(start[12:20], 'little')
+    size = int.from_bytes(start[20:28], 'little')
+    f.seek(32 + offset)
+    header = f.read(min(size, SEVENZIP_HEADER_LIMIT))
+    if not header:
+        return None
+    aes = SEVENZIP_AES_CODER in header
+    if header[0] == 0x17:
+        # Encoded header: an AES coder here encrypts the header itself; otherwise
+        # it is only compressed and the file coders can't be seen without 7-Zip
+        return (True, True) if aes else None
+    if header[0] == 0x01 and (aes or size <= SEVENZIP_HEADER_LIMIT):
+        return False, aes
+    return None
+
+def detect_encryption(path, fmt):
+    """Tell from the headers whether an archive is encrypted: (headers encrypted, data encrypted) or None"""
+    try:
+        with open(path, 'rb') as f:
+            if fmt == 'rar':
+                return rar_encryption(f.read(SNIFF_SIZE))
+            if fmt == '7z':
+                return sevenzip_encryption(f)
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+# Bytes hashed from each end of an archive for its quick fingerprint
+FINGERPRINT_CHUNK = 64 * 1024
+
+def quick_fingerprint(path, size):
+    """Hash the size plus the first and last 64 KB of a file"""
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    try:
+        with open(path, 'rb') as f:
+            digest.update(f.read(FINGERPRINT_CHUNK))
+            if size > 2 * FINGERPRINT_CHUNK:
+                f.seek(-FINGERPRINT_CHUNK, os.SEEK_END)
+                digest.update(f.read(FINGERPRINT_CHUNK))
+            elif size > FINGERPRINT_CHUNK:
+                digest.update(f.read())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+# Multi-volume naming schemes; the number orders the parts of a set
+VOLUME_PATTERNS = (
+    ('rar-part', re.compile(r'^(.+)\.part(\d+)\.rar$', re.IGNORECASE)),
+    ('rar-old', re.compile(r'^(.+)\.r(\d{2,3})$', re.IGNORECASE)),
+    ('zip-split', re.compile(r'^(.+)\.z(\d{2,3})$', re.IGNORECASE)),
+    ('split', re.compile(r'^(.+)\.(\d{3})$')),
+)
+
+def read_tail(path, size):
+    """Read the last bytes of a file"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - size))
+            return f.read()
+    except OSError:
+        return b''
+
+def rar_expects_next_volume(path):
+    """Check a RAR volume's end-of-archive block for the 'more volumes follow' flag"""
+    tail = read_tail(path, 32)
+    # RAR5: size 3, type 5 (end of archive), header flags, end flags (bit 0 = not last volume)
+    if tail[-4:-1] == b'\x03\x05\x04':
+        return bool(tail[-1] & 0x01)
+    # RAR4: CRC(2) type 0x7B flags(2) size(2), optionally followed by CRC and volume number
+    for size in range(7, min(len(tail), 20) + 1):
+        block = tail[-size:]
+        if block[2] == 0x7B and int.from_bytes(block[5:7], 'little') == size:
+            return bool(int.from_bytes(block[3:5], 'little') & 0x0001)
+    return False
+
+def zip_split_disk_count(path):
+    """Read how many parts a split ZIP has from the end-of-central-directory record"""
+    tail = read_tail(path, 65536 + 22)
+    position = tail.rfind(b'PK\x05\x06')
+    if position < 0 or len(tail) < position + 8:
+        return None
+    return int.from_bytes(tail[position + 4:position + 6], 'little') + 1
+
+def sevenzip_expected_size(path):
+    """Total archive size announced by a 7z signature header"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(32)
+    except OSError:
+        return None
+    if len(header) < 32 or not header.startswith(b'7z\xbc\xaf\x27\x1c'):
+        return None
+    next_header_offset = int.from_bytes(header[12:20], 'little')
+    next_header_size = int.from_bytes(header[20:28], 'little')
+    return 32 + next_header_offset + next_header_size
+
+def safe_member_path(root, name):
+    """Map an archive member name to a path inside root (None if nothing is left)"""
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+    if platform.system() == "Windows":
+        parts = [re.sub(r'[:<>|"?*]', '_', part).rstrip(' .') or '_' for part in parts]
+    if not parts:
+        return None
+    return os.path.join(root, *parts)
+
+def get_cache_dir():
+    """Get the per-user cache directory for AutoExtract state files"""
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif platform.system() == "Darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "AutoExtract")
+
+# Extractions are written into a hidden sibling folder and renamed into place on success;
+# the host and pid in the name tell a later run whether the owner is still alive
+STAGING_PREFIX = ".autoextract-staging-"
+STAGING_PATTERN = re.compile(r'^\.autoextract-staging-(.+)-(\d+)-([0-9a-f]+)$')
+
+def staging_host():
+    """This machine's name as it appears in staging folder names"""
+    return re.sub(r'[^A-Za-z0-9.]', '_', platform.node()) or 'localhost'
+
+def process_alive(pid):
+    """Check whether a process with this pid is running on this machine"""
+    if platform.system() == "Windows":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            # ERROR_ACCESS_DENIED means it exists but belongs to someone else
+            return kernel32.GetLastError() == 5
+        try:
+            exit_code = ctypes.c_ulong()
+            # STILL_ACTIVE
+            return not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)) or exit_code.value == 259
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # EPERM: the process exists but belongs to another user
+        return True
+    return True
+
+def is_stale_staging(name):
+    """True for a staging folder left behind by a process on this machine that has died"""
+    match = STAGING_PATTERN.match(name)
+    if not match or match.group(1) != staging_host():
+        # Another machine's run on a shared drive can't be checked from here
+        return False
+    pid = int(match.group(2))
+    return pid != os.getpid() and not process_alive(pid)
+
+class AtomicCounter:
+    """Integer counter that can be updated from several worker threads"""
+    def __init__(self, value=0):
+        self._value = value
+        self._lock = threading.Lock()
+    
+    def increment(self, amount=1):
+        with self._lock:
+            self._value += amount
+            return self._value
+    
+    @property
+    def value(self):
+        return self._value
+
+class ExtractionResults:
+    """Thread-safe store of per-archive extraction results"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = defaultdict(list)
+    
+    def add(self, result):
+        """Record a result under 'all' and under 'success' or 'failed'"""
+        with self._lock:
+            self._results['success' if result['success'] else 'failed'].append(result)
+            self._results['all'].append(result)
+    
+    def __getitem__(self, key):
+        with self._lock:
+            return list(self._results[key])
+
+class ExtractedFile:
+    """One extracted file, built on demand by ExtractedFiles"""
+    __slots__ = ('path', 'size')
+    
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+class ExtractedFiles:
+    """Compact, thread-safe list of every extracted file across all archives"""
+    # Files are stored column-wise: an index into a table of interned directories,
+    # the encoded file name in one shared buffer and the size in a typed array.
+    # That is a few dozen bytes per file instead of a dict holding three strings.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._directories = []
+        self._directory_ids = {}
+        self._parents = array('I')
+        self._names = bytearray()
+        self._name_ends = array('Q')
+        self._sizes = array('q')
+        self.total_size = 0
+    
+    def extend(self, root, manifest):
+        """Add an archive's (relative path, size) manifest extracted under root"""
+        with self._lock:
+            for relative_path, size in manifest:
+                directory, name = os.path.split(os.path.join(root, relative_path))
+                parent = self._directory_ids.get(directory)
+                if parent is None:
+                    parent = self._directory_ids[directory] = len(self._directories)
+                    self._directories.append(directory)
+                self._parents.append(parent)
+                self._names += os.fsencode(name)
+                self._name_ends.append(len(self._names))
+                self._sizes.append(size)
+                self.total_size += size
+    
+    def __len__(self):
+        return len(self._sizes)
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        start = self._name_ends[index - 1] if index else 0
+        name = os.fsdecode(bytes(self._names[start:self._name_ends[index]]))
+        return ExtractedFile(os.path.join(self._directories[self._parents[index]], name), self._sizes[index])
+    
+    def __iter__(self):
+        # Files added after iteration starts are not visited
+        for index in range(len(self)):
+            yield self[index]
+
+class ConsoleOutput:
+    """Serialises console output so lines from parallel workers never interleave"""
+    def __init__(self):
+        self._lock = threading.RLock()
+    
+    def write(self, lines):
+        """Print a block of lines in one piece"""
+        with self._lock:
+            print("\n".join(lines), flush=True)
+
+class ProgressReporter:
+    """Turns an engine's progress events into occasional one-line console updates"""
+    # Short extractions finish before anyone needs a progress line
+    QUIET_SECONDS = 5
+    
+    def __init__(self, console, name, step=25):
+        self.console = console
+        self.name = name
+        self.step = step
+        self.started = time.monotonic()
+        self.reported = 0
+    
+    def update(self, percent):
+        mark = percent // self.step * self.step
+        if mark > self.reported and mark < 100 and time.monotonic() - self.started > self.QUIET_SECONDS:
+            self.reported = mark
+            self.console.write([f"   ⏳ {self.name}: {percent}%"])
+
+class SevenZipLocator:
+    """Find the best installed 7-Zip binary, caching version probes on disk"""
+    # Official 7-Zip builds (7zz) are newer and faster than the p7zip port;
+    # 7za is the standalone build without RAR support, so it ranks last
+    FLAVOUR_RANK = {'7zz': 3, '7z': 2, '7zzs': 1, '7za': 0}
+    VERSION_PATTERN = re.compile(r"(?:7-Zip|p7zip)[^\d]*?(\d+)\.(\d+)")
+    
+    def __init__(self, candidates, cache_path=None):
+        self.candidates = candidates
+        self.cache_path = cache_path or os.path.join(get_cache_dir(), "7zip.json")
+    
+    def resolve(self, candidate):
+        """Turn a candidate name or path into an absolute executable path"""
+        if os.path.isabs(candidate):
+            return candidate if os.path.isfile(candidate) else None
+        return shutil.which(candidate)
+    
+    def probe_version(self, path):
+        """Run the binary once without arguments and parse its banner"""
+        try:
+            result = subprocess.run([path], capture_output=True, text=True, timeout=5, check=False)
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        match = self.VERSION_PATTERN.search(result.stdout + result.stderr)
+        if not match:
+            return None
+        return [int(match.group(1)), int(match.group(2))]
+    
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # A different PATH can resolve to different binaries
+        if cache.get('path_env') != os.environ.get('PATH', ''):
+            return {}
+        return cache.get('binaries', {})
+    
+    def save_cache(self, binaries):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'path_env': os.environ.get('PATH', ''), 'binaries': binaries}, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+    
+    def rank(self, path, info):
+        flavour = os.path.splitext(os.path.basename(path))[0].lower()
+        return (flavour != '7za', tuple(info['version']), self.FLAVOUR_RANK.get(flavour, 0))
+    
+    def locate(self):
+        """Return (path, version) of the preferred 7-Zip binary, or None"""
+        cached = self.load_cache()
+        binaries = {}
+        for candidate in self.candidates:
+            path = self.resolve(candidate)
+            if not path or path in binaries:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            
+            # Only probe binaries that are new or were replaced since the last run
+            info = cached.get(path)
+            if not info or info.get('mtime') != mtime:
+                version = self.probe_version(path)
+                info = {'mtime': mtime, 'version': version}
+            binaries[path] = info
+        
+        if binaries != cached:
+            self.save_cache(binaries)
+        
+        usable = [(path, info) for path, info in binaries.items() if info['version']]
+        if not usable:
+            return None
+        path, info = max(usable, key=lambda item: self.rank(*item))
+        major, minor = info['version']
+        return path, f"{major}.{minor:02d}"
+
+class SevenZipError(Exception):
+    """7-Zip exited with a non-zero code"""
+    summary = "7-Zip error"
+    
+    def __init__(self, detail="", exit_code=None):
+        super().__init__(detail or self.summary)
+        self.detail = detail
+        self.exit_code = exit_code
+    
+    def describe(self):
+        """Summary of the error class plus 7-Zip's own message, if any"""
+        return f"{self.summary}: {self.detail}" if self.detail else self.summary
+
+class SevenZipWarning(SevenZipError):
+    """Exit code 1: non-fatal errors, the archive was still processed"""
+    summary = "7-Zip warning"
+
+class SevenZipFatalError(SevenZipError):
+    """Exit code 2: the archive could not be processed"""
+    summary = "7-Zip fatal error"
+
+class SevenZipPasswordError(SevenZipFatalError):
+    """The archive is encrypted and the password is missing or wrong"""
+    summary = "Wrong password or encrypted archive"
+
+class SevenZipCorruptError(SevenZipFatalError):
+    """Data, CRC or header errors"""
+    summary = "Corrupt archive"
+
+class SevenZipUnsupportedError(SevenZipFatalError):
+    """Compression method or archive type 7-Zip can't handle"""
+    summary = "Compression method not supported"
+
+class SevenZipUsageError(SevenZipError):
+    """Exit code 7: command line error"""
+    summary = "7-Zip command line error"
+
+class SevenZipMemoryError(SevenZipError):
+    """Exit code 8: not enough memory"""
+    summary = "7-Zip ran out of memory"
+
+class SevenZipAbortedError(SevenZipError):
+    """Exit code 255: the user stopped the process"""
+    summary = "7-Zip was stopped"
+
+class SevenZipTimeoutError(SevenZipError):
+    """7-Zip produced no output for too long and was killed"""
+    summary = "Extraction timed out"
+
+class SevenZipDriver:
+    """Runs 7-Zip with machine-readable switches and parses its output as it streams"""
+    EXIT_CODE_ERRORS = {
+        1: SevenZipWarning,
+        2: SevenZipFatalError,
+        7: SevenZipUsageError,
+        8: SevenZipMemoryError,
+        255: SevenZipAbortedError,
+    }
+    # Fatal errors are refined by what 7-Zip printed, most specific first
+    FATAL_PATTERNS = (
+        (re.compile(r"wrong password|encrypted archive", re.IGNORECASE), SevenZipPasswordError),
+        (re.compile(r"unsupported (compression )?method|unsupported feature", re.IGNORECASE), SevenZipUnsupportedError),
+        (re.compile(r"data error|crc failed|headers error|unexpected end|"
+                    r"can ?not open (the )?file as archive|is not archive", re.IGNORECASE), SevenZipCorruptError),
+    )
+    PROGRESS_PATTERN = re.compile(r"^\s*(\d{1,3})%")
+    LINE_SPLIT = re.compile(r"[\r\n\b]+")
+    
+    def __init__(self, executable, version=None, idle_timeout=300):
+        self.executable = executable
+        self.version = version
+        self.idle_timeout = idle_timeout
+    
+    def base_command(self, command, archive_path, password):
+        cmd = [self.executable, command, archive_path, "-bsp1", "-bso1", "-bse1", "-y"]
+        # An explicit (possibly empty) password stops 7-Zip from prompting on the terminal
+        cmd.append(f"-p{password or ''}")
+        if self.version and float(self.version) >= 16:
+            cmd.append("-sccUTF-8")
+        return cmd
+    
+    def list(self, archive_path, password=None, on_line=None):
+        """List an archive in technical (-slt) format"""
+        self.run(self.base_command("l", archive_path, password) + ["-slt"], on_line=on_line)
+    
+    def test(self, archive_path, password=None, names=(), on_line=None):
+        """Test an archive, or only the named entries, without writing anything"""
+        cmd = self.base_command("t", archive_path, password)
+        if names:
+            if self.version and float(self.version) >= 16:
+                # Entry names are literal paths, not wildcards
+                cmd.append("-spd")
+            cmd += ["--", *names]
+        self.run(cmd, on_line=on_line)
+    
+    def extract(self, archive_path, extraction_path, password=None, on_progress=None, on_line=None):
+        """Extract an archive, listing each written file at -bb1 level"""
+        cmd = self.base_command("x", archive_path, password) + [f"-o{extraction_path}", "-bb1"]
+        self.run(cmd, on_progress, on_line)
+    
+    def run(self, cmd, on_progress=None, on_line=None):
+        """Run 7-Zip, streaming its output to the callbacks; raises a SevenZipError subclass on failure"""
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT)
+        # Only the last few lines are kept for error messages, however much 7-Zip prints
+        recent = deque(maxlen=20)
+        matched = []
+        last_output = [time.monotonic()]
+        timed_out = threading.Event()
+        finished = threading.Event()
+        
+        def watchdog():
+            while not finished.wait(1.0):
+                if time.monotonic() - last_output[0] > self.idle_timeout:
+                    timed_out.set()
+                    process.kill()
+                    return
+        
+        threading.Thread(target=watchdog, name="7z-watchdog", daemon=True).start()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ""
+        percent = None
+        try:
+            while True:
+                chunk = process.stdout.read1(65536)
+                if not chunk:
+                    break
+                last_output[0] = time.monotonic()
+                parts = self.LINE_SPLIT.split(pending + decoder.decode(chunk))
+                pending = parts.pop()
+                for line in parts:
+                    match = self.PROGRESS_PATTERN.match(line)
+                    if match:
+                        if on_progress and int(match.group(1)) != percent:
+                            percent = int(match.group(1))
+                            on_progress(percent)
+                        continue
+                    line = line.strip()
+                    if not line:
+                        continue
+                    recent.append(line)
+                    if not matched:
+                        for pattern, error_class in self.FATAL_PATTERNS:
+                            if pattern.search(line):
+                                matched.append(error_class)
+                                break
+                    if on_line:
+                        on_line(line)
+            if pending.strip() and on_line:
+                on_line(pending.strip())
+            process.wait()
+        finally:
+            finished.set()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+        
+        if timed_out.is_set():
+            raise SevenZipTimeoutError(f"no output for {self.idle_timeout} seconds")
+        if process.returncode == 0:
+            return
+        error_class = self.EXIT_CODE_ERRORS.get(process.returncode, SevenZipFatalError)
+        if error_class is SevenZipFatalError and matched:
+            error_class = matched[0]
+        detail = next((line for line in reversed(recent) if 'error' in line.lower() or 'warning' in line.lower()), "")
+        raise error_class(detail, process.returncode)
+
+class ArchiveInfo:
+    """What a listing probe learned about an archive before anything is written"""
+    __slots__ = ('entry_count', 'uncompressed_size', 'packed_size', 'solid', 'methods',
+                 'encrypted', 'headers_encrypted', 'files', 'smallest_encrypted')
+    
+    def __init__(self):
+        self.entry_count = 0
+        self.uncompressed_size = 0
+        self.packed_size = 0
+        self.solid = False
+        self.methods = set()
+        self.encrypted = False
+        self.headers_encrypted = False
+        # (relative path, size) of every regular file; None when the entries are unknown
+        self.files = []
+        # (name, size) of the cheapest entry to test a password against
+        self.smallest_encrypted = None
+    
+    def add_entry(self, name, size, is_dir=False, encrypted=False, method=None, packed_size=0):
+        self.entry_count += 1
+        self.packed_size += packed_size
+        if method:
+            self.methods.add(method)
+        if encrypted:
+            self.encrypted = True
+            if not is_dir and (self.smallest_encrypted is None or size < self.smallest_encrypted[1]):
+                self.smallest_encrypted = (name, size)
+        if not is_dir:
+            self.uncompressed_size += size
+            if self.files is not None:
+                self.files.append((name, size))
+    
+    def describe(self, format_size):
+        """One-line summary for the extraction log"""
+        parts = []
+        if self.files is not None:
+            parts.append(f"{self.entry_count} entries")
+        if self.uncompressed_size:
+            parts.append(f"{format_size(self.uncompressed_size)} uncompressed")
+        if self.solid:
+            parts.append("solid")
+        if self.methods:
+            parts.append("/".join(sorted(self.methods)))
+        if self.headers_encrypted:
+            parts.append("encrypted headers")
+        elif self.encrypted:
+            parts.append("encrypted")
+        return ", ".join(parts)
+
+class DiskSpaceGuard:
+    """Tracks free space promised to extractions that are still running"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reserved = defaultdict(int)
+    
+    def reserve(self, directory, size):
+        """Claim space on directory's filesystem; returns (token or None, bytes available)"""
+        try:
+            device = os.stat(directory).st_dev
+            free = shutil.disk_usage(directory).free
+        except OSError:
+            return (None, size), size
+        with self._lock:
+            available = free - self._reserved[device]
+            if size > available:
+                return None, available
+            self._reserved[device] += size
+        return (device, size), available
+    
+    def release(self, token):
+        device, size = token
+        if device is None:
+            return
+        with self._lock:
+            self._reserved[device] -= size
+
+class VolumeSet:
+    """The parts of one multi-volume archive, first volume first"""
+    __slots__ = ('name', 'volumes', 'size', 'mtime_ns', 'missing')
+    
+    def __init__(self, name, volumes, size, mtime_ns, missing):
+        self.name = name
+        self.volumes = volumes
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.missing = missing
+    
+    @property
+    def first(self):
+        return self.volumes[0]
+    
+    def __len__(self):
+        return len(self.volumes)
+
+class ScanIndex:
+    """SQLite record of archive outcomes so later runs can skip unchanged archives"""
+    EXTRACTED = 'extracted'
+    FAILED_CORRUPT = 'failed-corrupt'
+    NEEDS_PASSWORD = 'needs-password'
+    
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(get_cache_dir(), "index.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # One connection shared by the discovery and extraction threads
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS archives ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, fingerprint TEXT, "
+            "status TEXT, message TEXT, extraction_path TEXT, updated REAL)"
+        )
+        # Which password opened an archive, keyed by fingerprint and by volume set.
+        # Only a digest is kept, so the index never holds the secrets themselves
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS password_digests (key TEXT PRIMARY KEY, digest TEXT, updated REAL)"
+        )
+        self._conn.commit()
+    
+    def lookup(self, path, size, mtime_ns):
+        """Return the recorded status if the archive is unchanged since it was processed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, fingerprint, status FROM archives WHERE path = ?", (path,)
+            ).fetchone()
+        if not row or row[0] != size:
+            return None
+        if row[1] == mtime_ns:
+            return row[3]
+        
+        # Same size but touched: only the content fingerprint can tell
+        if row[2] and quick_fingerprint(path, size) == row[2]:
+            with self._lock:
+                self._conn.execute("UPDATE archives SET mtime_ns = ? WHERE path = ?", (mtime_ns, path))
+                self._conn.commit()
+            return row[3]
+        return None
+    
+    def record(self, path, size, mtime_ns, status, message, extraction_path=None):
+        """Store the outcome of processing an archive"""
+        fingerprint = quick_fingerprint(path, size)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, fingerprint, status, message, extraction_path, time.time())
+            )
+            self._conn.commit()
+    
+    @staticmethod
+    def password_digest(key, password):
+        # Salted with the key, so equal passwords on different archives don't match
+        return hashlib.sha256(f"{key}\0{password}".encode('utf-8', 'surrogatepass')).hexdigest()
+    
+    def known_password(self, keys, candidates):
+        """The candidate remembered under the first of keys that has one, if it is among them"""
+        candidates = [password for password in dict.fromkeys(candidates) if password]
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute("SELECT digest FROM password_digests WHERE key = ?", (key,)).fetchone()
+                if row:
+                    break
+            else:
+                return None
+        return next((password for password in candidates if self.password_digest(key, password) == row[0]), None)
+    
+    def remember_password(self, keys, password):
+        """Store a digest of the password that opened an archive under each of keys"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO password_digests VALUES (?, ?, ?)",
+                [(key, self.password_digest(key, password), time.time()) for key in keys]
+            )
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class PasswordKeyring:
+    """Known passwords from a local JSON file, with glob and directory rules"""
+    # {"passwords": ["tried for every archive", ...],
+    #  "rules": [{"match": "*.part*.rar", "passwords": [...]},
+    #            {"directory": "/data/releases", "passwords": [...]}]}
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.passwords = [str(password) for password in data.get('passwords', [])]
+        self.rules = []
+        for rule in data.get('rules', []):
+            directory = rule.get('directory')
+            if directory:
+                directory = os.path.normcase(os.path.abspath(os.path.expanduser(directory)))
+            self.rules.append((rule.get('match'), directory, [str(p) for p in rule.get('passwords', [])]))
+    
+    def __len__(self):
+        return len(self.passwords) + sum(len(passwords) for match, directory, passwords in self.rules)
+    
+    def candidates(self, archive_path):
+        """Passwords worth trying for an archive, matching rules first, without duplicates"""
+        path = os.path.normcase(os.path.abspath(archive_path))
+        name = os.path.basename(path)
+        matched = []
+        for match, directory, passwords in self.rules:
+            if match and not (fnmatch.fnmatch(name, os.path.normcase(match)) or
+                              fnmatch.fnmatch(path, os.path.normcase(match))):
+                continue
+            if directory and not path.startswith(os.path.join(directory, '')):
+                continue
+            matched.extend(passwords)
+        return list(dict.fromkeys(matched + self.passwords))
+
+class ExtractedFilesDatabase:
+    """Disk-backed drop-in for ExtractedFiles when a run's file list won't fit in memory"""
+    # Rows are read back in batches of this size, so iterating costs bounded memory
+    BATCH_SIZE = 10000
+    
+    def __init__(self, db_path=None, root=None):
+        self.db_path = db_path or os.path.join(get_cache_dir(), "manifest.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Every run keeps its rows, so the database is also a record of what each run produced
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, root TEXT, started REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "run INTEGER, seq INTEGER, archive_root TEXT, path TEXT, size INTEGER, "
+            "PRIMARY KEY (run, seq))"
+        )
+        self.run = self._conn.execute("INSERT INTO runs (root, started) VALUES (?, ?)",
+                                      (root, time.time())).lastrowid
+        self._conn.commit()
+        self._count = 0
+        self.total_size = 0
+    
+    def extend(self, root, manifest):
+        """Add an archive's (relative path, size) manifest extracted under root"""
+        with self._lock:
+            rows = []
+            for relative_path, size in manifest:
+                rows.append((self.run, self._count, root, os.path.join(root, relative_path), size))
+                self._count += 1
+                self.total_size += size
+            self._conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+    
+    def __len__(self):
+        return self._count
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        with self._lock:
+            row = self._conn.execute("SELECT path, size FROM files WHERE run = ? AND seq = ?",
+                                     (self.run, index)).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return ExtractedFile(*row)
+    
+    def __iter__(self):
+        end = self._count
+        for start in range(0, end, self.BATCH_SIZE):
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT path, size FROM files WHERE run = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                    (self.run, start, min(start + self.BATCH_SIZE, end))
+                ).fetchall()
+            for row in rows:
+                yield ExtractedFile(*row)
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class NameAllocator:
+    """Hands out unused file names in one directory without probing the filesystem"""
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        # Windows and macOS volumes are normally case-insensitive
+        self._fold = platform.system() in ("Windows", "Darwin")
+        # The directory is listed once; afterwards only names handed out here are added
+        with os.scandir(directory) as it:
+            self._taken = {self._key(entry.name) for entry in it}
+        # Next suffix to try per requested name, so the 100,000th 'index.html' is
+        # found without walking past the first 99,999
+        self._next_counter = {}
+    
+    def _key(self, name):
+        return name.casefold() if self._fold else name
+    
+    def allocate(self, filename):
+        """Reserve filename, or the first free name_N.ext after it, and return its path"""
+        with self._lock:
+            candidate = filename
+            if self._key(candidate) in self._taken:
+                name, ext = os.path.splitext(filename)
+                counter = self._next_counter.get(self._key(filename), 1)
+                candidate = f"{name}_{counter}{ext}"
+                while self._key(candidate) in self._taken:
+                    counter += 1
+                    candidate = f"{name}_{counter}{ext}"
+                self._next_counter[self._key(filename)] = counter + 1
+            self._taken.add(self._key(candidate))
+        return os.path.join(self.directory, candidate)
+
+class FolderAllocator:
+    """Claims uniquely named output folders with atomic mkdir calls"""
     def __init__(self):
-        self.supported_formats = {'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.tar.gz', '.tar.bz2', '.tar.xz'}
-        self.extraction_results = defaultdict(list)
+        self._lock = threading.Lock()
+        # Next suffix to try per wanted folder, so the thousandth data.zip in a
+        # directory doesn't walk past data_1 .. data_999 again
+        self._next_counter = {}
+    
+    def claim(self, path):
+        """Create path, or the first free path_N after it, and return the folder created"""
+        # Any error other than "already exists" (read-only parent, disk full) is raised
+        while True:
+            with self._lock:
+                counter = self._next_counter.get(path, 0)
+                self._next_counter[path] = counter + 1
+            candidate = f"{path}_{counter}" if counter else path
+            try:
+                # mkdir either creates the folder or fails, so two workers (or two
+                # processes) can never both own it
+                os.mkdir(candidate)
+                return candidate
+            except FileExistsError:
+                continue
+
+class ShortCopyError(OSError):
+    """A kernel copy stopped before the end of the file; the next method should redo it"""
+
+class ParallelCopier:
+    """Copies files from a thread pool, limiting concurrent writes per destination device"""
+    # Progress is printed at most this often instead of once per file
+    PROGRESS_INTERVAL = 2.0
+    # Fastest first: a reflink shares the data blocks, copy_file_range and sendfile
+    # keep the bytes in the kernel, and the buffered copy works everywhere
+    METHODS = ('reflink', 'copy_file_range', 'sendfile', 'buffered')
+    # The linux/fs.h ioctl that clones a whole file on btrfs, XFS and other CoW filesystems
+    FICLONE = 0x40049409
+    # Errors meaning "this filesystem pair can't do that", as opposed to a failed copy
+    UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS,
+                          errno.ENOTTY, errno.ENOTSOCK, errno.EBADF, errno.EPERM}
+    # Hard links fall back to a copy across devices, on filesystems without
+    # them (FAT, exFAT) and once a file has too many links
+    NO_HARDLINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTSUP}
+    MODES = ('copy', 'move', 'hardlink', 'symlink')
+    
+    def __init__(self, console, format_size, workers=None, per_device=8, mode='copy'):
+        self.console = console
+        self.format_size = format_size
+        self.mode = mode
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.per_device = per_device
+        self._lock = threading.Lock()
+        self._devices = {}
+        self._device_slots = {}
+        # First method worth trying for each (source device, target device) pair
+        self._first_method = {}
+        self.method_counts = defaultdict(lambda: [0, 0])
+        self.copied_files = 0
+        self.copied_size = 0
+        self.failed_files = 0
+        self.elapsed = 0.0
+        self._started = 0.0
+        self._last_report = 0.0
+    
+    @property
+    def bytes_per_second(self):
+        return self.copied_size / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def slots_for(self, target_path):
+        """Semaphore bounding the copies that write to target_path's device"""
+        directory = os.path.dirname(target_path)
+        with self._lock:
+            device = self._devices.get(directory)
+        if device is None:
+            try:
+                device = os.stat(directory).st_dev
+            except OSError:
+                device = -1
+        with self._lock:
+            self._devices[directory] = device
+            slots = self._device_slots.get(device)
+            if slots is None:
+                slots = self._device_slots[device] = threading.BoundedSemaphore(self.per_device)
+        return slots
+    
+    def describe_methods(self):
+        """Which copy methods were used, e.g. 'reflink: 120 files (4.00 GB)'"""
+        return ", ".join(f"{method}: {files} files ({self.format_size(size)})"
+                         for method, (files, size) in self.method_counts.items()) or "none"
+    
+    def copy_file(self, source, target):
+        """Copy data and metadata with the fastest method the filesystems allow; returns the method"""
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            key = (os.fstat(src.fileno()).st_dev, os.fstat(dst.fileno()).st_dev)
+            method = 'buffered'
+            for index in range(self._first_method.get(key, 0) if size else len(self.METHODS) - 1,
+                               len(self.METHODS)):
+                method = self.METHODS[index]
+                try:
+                    getattr(self, f"_copy_{method}")(src, dst, size)
+                    break
+                except ShortCopyError:
+                    # Only this file came up short, so the method stays first for the pair
+                    pass
+                except OSError as e:
+                    if e.errno not in self.UNSUPPORTED_ERRNOS or method == 'buffered':
+                        raise
+                    # Unsupported here: remember that for the filesystem pair
+                    with self._lock:
+                        self._first_method[key] = max(self._first_method.get(key, 0), index + 1)
+                # Start the next method from scratch
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copystat(source, target)
+        return method
+    
+    def transfer(self, source, target):
+        """Place source at target as the mode asks; returns the method used"""
+        if self.mode == 'symlink':
+            os.symlink(os.path.abspath(source), target)
+            return 'symlink'
+        try:
+            if self.mode == 'move':
+                os.rename(source, target)
+                return 'rename'
+            if self.mode == 'hardlink':
+                os.link(source, target)
+                return 'hardlink'
+        except OSError as e:
+            fallback = {errno.EXDEV} if self.mode == 'move' else self.NO_HARDLINK_ERRNOS
+            if e.errno not in fallback:
+                raise
+        
+        method = self.copy_file(source, target)
+        if self.mode == 'move':
+            # Across devices a move is a copy followed by removing the original,
+            # which only goes once the copy is known to hold all of it
+            source_size, target_size = os.stat(source).st_size, os.stat(target).st_size
+            if target_size != source_size:
+                os.unlink(target)
+                raise OSError(errno.EIO, f"copied {target_size} of {source_size} bytes, original kept")
+            os.unlink(source)
+            method += "+unlink"
+        return method
+    
+    def _copy_reflink(self, src, dst, size):
+        try:
+            import fcntl
+        except ImportError:
+            raise OSError(errno.ENOSYS, "reflinks need fcntl")
+        if platform.system() != "Linux":
+            raise OSError(errno.ENOSYS, "FICLONE is Linux-only")
+        fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+    
+    def _copy_copy_file_range(self, src, dst, size):
+        if not hasattr(os, 'copy_file_range'):
+            raise OSError(errno.ENOSYS, "copy_file_range is not available")
+        copied = 0
+        while copied < size:
+            # Without offsets both file positions advance with the copy
+            sent = os.copy_file_range(src.fileno(), dst.fileno(), min(size - copied, 1 << 30))
+            if not sent:
+                raise ShortCopyError(errno.EIO, f"copy_file_range stopped after {copied} of {size} bytes")
+            copied += sent
+    
+    def _copy_sendfile(self, src, dst, size):
+        # Only Linux can sendfile between two regular files
+        if platform.system() != "Linux" or not hasattr(os, 'sendfile'):
+            raise OSError(errno.ENOSYS, "sendfile to a file is not available")
+        copied = 0
+        while copied < size:
+            sent = os.sendfile(dst.fileno(), src.fileno(), copied, min(size - copied, 1 << 30))
+            if not sent:
+                raise ShortCopyError(errno.EIO, f"sendfile stopped after {copied} of {size} bytes")
+            copied += sent
+    
+    def _copy_buffered(self, src, dst, size):
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    
+    def copy(self, jobs, total):
+        """Copy every (source, target, size) job; returns once all of them are done"""
+        self._started = self._last_report = time.perf_counter()
+        # Jobs are pulled lazily, so only a few are queued ahead of the workers
+        in_flight = threading.BoundedSemaphore(self.workers * 4)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="copy") as executor:
+            for source, target, size in jobs:
+                in_flight.acquire()
+                future = executor.submit(self._copy_one, source, target, size, total)
+                future.add_done_callback(lambda future: in_flight.release())
+        self.elapsed = time.perf_counter() - self._started
+    
+    def _copy_one(self, source, target, size, total):
+        try:
+            with self.slots_for(target):
+                method = self.transfer(source, target)
+        except Exception as e:
+            with self._lock:
+                self.failed_files += 1
+            self.console.write([f"   ❌ Failed: {os.path.basename(source)} - {e}"])
+            return
+        
+        with self._lock:
+            self.copied_files += 1
+            self.copied_size += size
+            self.method_counts[method][0] += 1
+            self.method_counts[method][1] += size
+            now = time.perf_counter()
+            if now - self._last_report < self.PROGRESS_INTERVAL:
+                return
+            self._last_report = now
+            done = self.copied_files + self.failed_files
+            rate = self.copied_size / max(now - self._started, 1e-6)
+            line = (f"   [{done}/{total}] {self.format_size(self.copied_size)} done "
+                    f"({self.format_size(rate)}/s)")
+        self.console.write([line])
+
+class ArchiveScanner:
+    """Parallel directory walker built on os.scandir"""
+    def __init__(self, max_depth=None, follow_symlinks=False, workers=None, on_staging=None):
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.dirs_scanned = 0
+        self.files_seen = 0
+        self.loops_skipped = 0
+        self.elapsed = 0.0
+        self.cancelled = threading.Event()
+        # Staging folders are never descended into; they are handed to this
+        # callback (from a scan thread) as soon as their parent is listed
+        self.on_staging = on_staging
+    
+    @property
+    def dirs_per_second(self):
+        return self.dirs_scanned / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def cancel(self):
+        """Stop walking after the directory currently being processed"""
+        self.cancelled.set()
+    
+    def _scan_dir(self, path, depth, results):
+        """List one directory and hand its files and subdirectories to the walker"""
+        files = []
+        subdirs = []
+        descend = self.max_depth is None or depth < self.max_depth
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        # DirEntry caches the d_type from the directory listing, so
+                        # regular files and directories cost no extra stat call
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            if entry.name.startswith(STAGING_PREFIX):
+                                if self.on_staging:
+                                    self.on_staging(entry.path)
+                                continue
+                            if not descend:
+                                continue
+                            key = None
+                            if self.follow_symlinks:
+                                st = entry.stat()
+                                key = (st.st_dev, st.st_ino)
+                            subdirs.append((entry.path, key))
+                        elif entry.is_file():
+                            files.append(entry)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        finally:
+            results.put((path, depth, files, subdirs))
+    
+    def walk(self, root):
+        """Yield (directory, file entries) batches while subtrees are scanned in parallel"""
+        started = time.perf_counter()
+        visited = set()
+        if self.follow_symlinks:
+            try:
+                st = os.stat(root)
+                visited.add((st.st_dev, st.st_ino))
+            except OSError:
+                pass
+        
+        results = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan")
+        try:
+            executor.submit(self._scan_dir, root, 0, results)
+            outstanding = 1
+            while outstanding and not self.cancelled.is_set():
+                path, depth, files, subdirs = results.get()
+                outstanding -= 1
+                self.dirs_scanned += 1
+                self.files_seen += len(files)
+                
+                for subdir, key in subdirs:
+                    # Following symlinks can revisit a directory through another name
+                    if key is not None:
+                        if key in visited:
+                            self.loops_skipped += 1
+                            continue
+                        visited.add(key)
+                    executor.submit(self._scan_dir, subdir, depth + 1, results)
+                    outstanding += 1
+                
+                if files:
+                    # Time spent waiting on the consumer is not scan time
+                    paused = time.perf_counter()
+                    yield path, files
+                    started += time.perf_counter() - paused
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.elapsed += time.perf_counter() - started
+
+class ArchiveExtractor:
+    # patool never passes on the tool's output: a failed program only shows up as
+    # "Command `[...]' returned non-zero exit status N", with paths and -p in the command
+    PATOOL_COMMAND = re.compile(r"Command `(.*)' returned non-zero exit status (-?\d+)", re.DOTALL)
+    # Exit codes that mean the same thing for every archive a program handles
+    PATOOL_EXIT_CODES = {
+        ('unrar', 3): 'corrupt', ('rar', 3): 'corrupt',
+        ('unrar', 11): 'password', ('rar', 11): 'password',
+        ('unzip', 3): 'corrupt', ('unzip', 81): 'unsupported', ('unzip', 82): 'password',
+    }
+    # patool's own messages, checked in order once the `quoted' paths are removed
+    PATOOL_FAILURES = (
+        (re.compile(r"no support for password|with password is not supported", re.IGNORECASE),
+         'no-password-option'),
+        (re.compile(r"unknown archive|not supported|could not find an executable", re.IGNORECASE),
+         'unsupported'),
+    )
+    
+    # How each consolidation mode is announced and summarised
+    MODE_VERBS = {
+        'copy': ("Copying", "copied"),
+        'move': ("Moving", "moved"),
+        'hardlink': ("Hard linking", "linked"),
+        'symlink': ("Symlinking", "linked"),
+    }
+    
+    def __init__(self, max_depth=None, follow_symlinks=False, scan_workers=None, jobs=None, sniff_all=False,
+                 index_path=None, use_index=True, force=False, manifest_path=None, keyring_path=None):
+        self.supported_formats = {'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.tar.gz', '.tar.bz2', '.tar.xz',
+                                  '.tgz', '.tbz2', '.tbz', '.txz', '.tar.zst', '.tzst'}
+        self.extraction_results = ExtractionResults()
         self.total_archives = 0
-        self.successful_extractions = 0
-        self.failed_extractions = 0
-        self.password_protected = 0
+        self.processed_archives = AtomicCounter()
+        self.successful_extractions = AtomicCounter()
+        self.failed_extractions = AtomicCounter()
+        self.password_protected = AtomicCounter()
         self.global_password = None
-        self.all_extracted_files = []
+        self.all_extracted_files = ExtractedFiles()
+        self.manifest_path = manifest_path
+        self.manifest_db = None
+        self.keyring_path = keyring_path
+        self.keyring = None
+        # Last password that worked in each directory; siblings often share one
+        self.sibling_passwords = {}
+        # (password, info) for each encrypted archive the ask_each pre-flight
+        # looked at; a None password means the user skipped it
+        self.prepared_passwords = {}
+        self.stale_staging_removed = AtomicCounter()
+        self.discovery_error = None
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+        self.scan_workers = scan_workers
+        self.sniff_all = sniff_all
+        self.headers_checked = 0
+        self.non_archives_skipped = 0
+        self.index_path = index_path
+        self.use_index = use_index
+        self.force = force
+        self.index = None
+        self.unchanged_skipped = 0
+        self.password_policy = None
+        self.jobs = jobs or os.cpu_count() or 1
+        self.console = ConsoleOutput()
+        self.folders = FolderAllocator()
+        self.scanning = threading.Event()
+        self.disk_space = DiskSpaceGuard()
+        self.seven_zip_lock = threading.Lock()
+        self.seven_zip = None
+        self.seven_zip_located = False
         
     def format_size(self, size_bytes):
         """Convert bytes to human readable format"""
@@ -33,29 +1410,196 @@ class ArchiveExtractor:
         except OSError:
             return 0
     
-    def find_archives(self, directory, recursive=True):
-        """Find all supported archive files in directory"""
-        archives = []
-        print(f"🔍 Searching for archive files in: {directory}")
+    def make_scanner(self, recursive=True):
+        """Create a directory scanner for the selected scan mode"""
+        return ArchiveScanner(
+            max_depth=self.max_depth if recursive else 0,
+            follow_symlinks=self.follow_symlinks,
+            workers=self.scan_workers,
+            on_staging=self.sweep_staging_dir
+        )
+    
+    def should_sniff(self, name):
+        """Decide whether a file's header is worth reading"""
+        if self.sniff_all or self.is_supported_archive(name):
+            return True
+        # Extensionless files may be archives that lost their suffix
+        return '.' not in name
+    
+    def iter_archives(self, scanner, directory):
+        """Yield (path, format, volume set) for archives as soon as they are identified"""
+        # Header reads run on a thread pool; results are taken in discovery
+        # order and only waited on once the window of reads in flight is full
+        window = deque()
+        with ThreadPoolExecutor(max_workers=scanner.workers, thread_name_prefix="sniff") as sniffers:
+            for root, entries in scanner.walk(directory):
+                volume_sets, volume_paths = self.group_volumes(entries)
+                for volume_set in volume_sets:
+                    if not self.already_processed(volume_set.first, volume_set.size, volume_set.mtime_ns):
+                        yield volume_set.first, None, volume_set
+                
+                for entry in entries:
+                    if entry.path in volume_paths or not self.should_sniff(entry.name):
+                        continue
+                    if self.entry_processed(entry):
+                        continue
+                    window.append((entry.path, sniffers.submit(sniff_format, entry.path)))
+                while window and (window[0][1].done() or len(window) > SNIFF_WINDOW):
+                    yield from self.take_sniffed(window)
+            while window:
+                yield from self.take_sniffed(window)
+    
+    def group_volumes(self, entries):
+        """Group the parts of multi-volume archives found in one directory"""
+        by_name = {entry.name.lower(): entry for entry in entries}
+        groups = defaultdict(dict)
+        for entry in entries:
+            for scheme, pattern in VOLUME_PATTERNS:
+                match = pattern.match(entry.name)
+                if match:
+                    number = int(match.group(2))
+                    if scheme == 'rar-old':
+                        number += 1  # name.rar is volume 0, name.r00 volume 1
+                    groups[(scheme, match.group(1))][number] = entry
+                    break
+        
+        volume_sets = []
+        volume_paths = set()
+        for (scheme, base), parts in groups.items():
+            if scheme == 'split' and not self.is_supported_archive(base):
+                continue  # log.001 and friends are not archive volumes
+            if scheme in ('rar-old', 'zip-split'):
+                # data.r05 is only a volume next to its .rar/.zip or with the format's signature
+                fmt = 'rar' if scheme == 'rar-old' else 'zip'
+                if f"{base}.{fmt}".lower() not in by_name and sniff_format(parts[min(parts)].path) != fmt:
+                    continue
+            volume_set = self.build_volume_set(scheme, base, parts, by_name)
+            if volume_set:
+                volume_sets.append(volume_set)
+                volume_paths.update(volume_set.volumes)
+        return volume_sets, volume_paths
+    
+    def build_volume_set(self, scheme, base, parts, by_name):
+        """Order a group of volumes and work out which parts are missing"""
+        head = None
+        if scheme == 'rar-old':
+            head = by_name.get(f"{base}.rar".lower())
+            if head:
+                parts[0] = head
+        elif scheme == 'zip-split':
+            # The .zip holds the central directory and is the last part, but 7-Zip opens it first
+            head = by_name.get(f"{base}.zip".lower())
+            if head:
+                parts[max(parts) + 1] = head
+        
+        start = 0 if scheme == 'rar-old' else 1
+        last = max(parts)
+        missing = [self.volume_label(scheme, base, number) for number in range(start, last + 1) if number not in parts]
+        
+        # Trailing volumes leave no gap in the numbering, so ask the archive itself
+        if scheme in ('rar-part', 'rar-old') and rar_expects_next_volume(parts[last].path):
+            missing.append(f"volumes after {parts[last].name}")
+        elif scheme == 'zip-split':
+            if head is None:
+                missing.append(f"{base}.zip")
+            else:
+                disks = zip_split_disk_count(head.path)
+                if disks and disks > last:
+                    missing.extend(self.volume_label(scheme, base, number) for number in range(last, disks))
+        
+        size = 0
+        mtime_ns = 0
+        for entry in parts.values():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            size += st.st_size
+            mtime_ns = max(mtime_ns, st.st_mtime_ns)
+        
+        if scheme == 'split':
+            expected = sevenzip_expected_size(parts[min(parts)].path)
+            if expected and expected > size:
+                missing.append(f"volumes after {parts[last].name} ({self.format_size(expected - size)} short)")
+        
+        if len(parts) == 1 and not missing and scheme == 'rar-part':
+            return None  # A lone .part1.rar is simply an archive
         
-        if recursive:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    filepath = os.path.join(root, file)
-                    if self.is_supported_archive(filepath):
-                        archives.append(filepath)
+        if scheme == 'zip-split' and head is not None:
+            ordered = [head.path] + [parts[number].path for number in sorted(parts) if parts[number] is not head]
         else:
-            for item in os.listdir(directory):
-                filepath = os.path.join(directory, item)
-                if os.path.isfile(filepath) and self.is_supported_archive(filepath):
-                    archives.append(filepath)
+            ordered = [parts[number].path for number in sorted(parts)]
         
-        return archives
+        extension = {'rar-part': '.rar', 'rar-old': '.rar', 'zip-split': '.zip', 'split': ''}[scheme]
+        return VolumeSet(base + extension, ordered, size, mtime_ns, missing)
+    
+    def volume_label(self, scheme, base, number):
+        """Name the file that holds a given volume number"""
+        if scheme == 'rar-part':
+            return f"{base}.part{number}.rar"
+        if scheme == 'rar-old':
+            return f"{base}.rar" if number == 0 else f"{base}.r{number - 1:02d}"
+        if scheme == 'zip-split':
+            return f"{base}.z{number:02d}"
+        return f"{base}.{number:03d}"
+    
+    def entry_processed(self, entry):
+        """Check the scan index for a directory entry"""
+        if not self.index or self.force:
+            return False
+        try:
+            st = entry.stat()
+        except OSError:
+            return False
+        return self.already_processed(entry.path, st.st_size, st.st_mtime_ns)
+    
+    def already_processed(self, path, size, mtime_ns):
+        """Check the scan index for an unchanged archive with a final outcome"""
+        if not self.index or self.force:
+            return False
+        status = self.index.lookup(os.path.abspath(path), size, mtime_ns)
+        if status is None:
+            return False
+        # A password-protected archive is worth another try if we may get a password
+        if status == ScanIndex.NEEDS_PASSWORD and self.password_policy != 'skip_all':
+            return False
+        self.unchanged_skipped += 1
+        return True
+    
+    def take_sniffed(self, window):
+        """Pop the oldest header read and yield it if it is an archive"""
+        path, future = window.popleft()
+        fmt = future.result()
+        self.headers_checked += 1
+        if fmt:
+            yield path, fmt, None
+        else:
+            self.non_archives_skipped += 1
+    
+    def report_scan(self, scanner):
+        """Print directory scan statistics"""
+        print(f"📂 Scanned {scanner.dirs_scanned} directories ({scanner.files_seen} files) "
+              f"in {scanner.elapsed:.2f}s - {scanner.dirs_per_second:.0f} dirs/sec")
+        if scanner.loops_skipped:
+            print(f"   ↩️  Skipped {scanner.loops_skipped} symlink loops")
+        if self.stale_staging_removed.value:
+            print(f"🧹 Removed {self.stale_staging_removed.value} staging folders left by interrupted runs")
+        print(f"🔎 Checked {self.headers_checked} file headers, skipped {self.non_archives_skipped} non-archives")
+        if self.unchanged_skipped:
+            print(f"⏭️  Skipped {self.unchanged_skipped} unchanged archives processed by earlier runs (use --force to redo)")
+    
+    def archive_suffix(self, filepath):
+        """Get the archive suffix, keeping compound ones like '.tar.gz' together"""
+        name = os.path.basename(filepath).lower()
+        if name.endswith(TAR_SUFFIXES):
+            for suffix in TAR_SUFFIXES:
+                if name.endswith(suffix) and len(name) > len(suffix):
+                    return suffix
+        return os.path.splitext(name)[1]
     
     def is_supported_archive(self, filepath):
         """Check if file is a supported archive format"""
-        extension = Path(filepath).suffix.lower()
-        return extension in self.supported_formats
+        return self.archive_suffix(filepath) in self.supported_formats
     
     def ask_scan_mode(self):
         """Ask user whether to scan current directory only or include subdirectories"""
@@ -92,81 +1636,376 @@ class ArchiveExtractor:
             else:
                 print("Invalid choice! Please enter 1, 2, or 3.")
     
-    def get_extraction_path(self, archive_path):
-        """Generate extraction path based on archive name"""
-        archive_dir = os.path.dirname(archive_path)
-        archive_name = Path(archive_path).stem
-        extraction_dir = os.path.join(archive_dir, archive_name)
-        
-        counter = 1
-        original_dir = extraction_dir
-        while os.path.exists(extraction_dir):
-            extraction_dir = f"{original_dir}_{counter}"
-            counter += 1
-        
-        return extraction_dir
+    def load_keyring(self):
+        """Read the password keyring, if one is configured or in the default place"""
+        path = self.keyring_path or os.path.join(get_cache_dir(), "keyring.json")
+        if self.keyring or not (self.keyring_path or os.path.exists(path)):
+            return
+        try:
+            self.keyring = PasswordKeyring(path)
+            print(f"🔑 Keyring: {len(self.keyring)} passwords from {path}")
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️  Keyring unavailable: {e}")
+    
+    def password_keys(self, archive_path, volumes=None):
+        """Index keys a working password is remembered under"""
+        size = volumes.size if volumes else self.get_archive_size(archive_path)
+        keys = [f"fingerprint:{quick_fingerprint(archive_path, size)}"]
+        if volumes:
+            keys.append(f"volumes:{os.path.join(os.path.dirname(archive_path), volumes.name)}")
+        return keys
     
-    def collect_extracted_files(self, extraction_path):
-        """Collect all files from extraction directory"""
-        extracted_files = []
-        total_size = 0
+    def remember_password(self, archive_path, volumes, password):
+        """Note a working password for this archive, its set and its siblings"""
+        self.sibling_passwords[os.path.dirname(archive_path)] = password
+        if self.index:
+            self.index.remember_password(self.password_keys(archive_path, volumes), password)
+    
+    def find_known_password(self, archive_path, fmt, volumes, info, current_password=None):
+        """Try remembered, sibling and keyring passwords with cheap checks; returns one that works"""
+        sibling = self.sibling_passwords.get(os.path.dirname(archive_path))
+        keyring = self.keyring.candidates(archive_path) if self.keyring else []
+        # The index only knows which password worked, so it picks one of those on hand;
+        # one that was typed in an earlier run is not among them unless it is in the keyring
+        remembered = (self.index.known_password(self.password_keys(archive_path, volumes),
+                                                [sibling, current_password] + keyring)
+                      if self.index else None)
+        preferred = [password for password in dict.fromkeys([remembered, sibling, current_password]) if password]
+        for password in preferred:
+            # A remembered password is trusted when it can't be checked cheaply
+            if self.verify_password(archive_path, password, fmt, volumes, info) is not False:
+                return password
         
+        candidates = [p for p in keyring if p not in preferred]
+        if not candidates:
+            return None
+        # Each check decrypts one small entry (or spawns one 7-Zip), so they run side by side
+        executor = ThreadPoolExecutor(max_workers=min(len(candidates), os.cpu_count() or 1),
+                                      thread_name_prefix="keyring")
         try:
-            for root, dirs, files in os.walk(extraction_path):
-                for file in files:
-                    filepath = os.path.join(root, file)
-                    try:
-                        file_size = os.path.getsize(filepath)
-                        extracted_files.append({
-                            'path': filepath,
-                            'size': file_size,
-                            'relative_path': os.path.relpath(filepath, extraction_path)
-                        })
-                        total_size += file_size
-                    except OSError:
-                        continue
+            checks = {executor.submit(self.verify_password, archive_path, p, fmt, volumes, info): p
+                      for p in candidates}
+            for check in as_completed(checks):
+                if check.result():
+                    return checks[check]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return None
+    
+    def get_extraction_path(self, archive_path, archive_name=None):
+        """Generate the wanted extraction path based on archive name (claimed when publishing)"""
+        archive_dir = os.path.dirname(archive_path)
+        archive_name = archive_name or os.path.basename(archive_path)
+        suffix = self.archive_suffix(archive_name)
+        if suffix and len(archive_name) > len(suffix):
+            archive_name = archive_name[:-len(suffix)]
+        return os.path.join(archive_dir, archive_name)
+    
+    def make_staging_dir(self, extraction_path):
+        """Create a hidden staging folder next to extraction_path (same filesystem)"""
+        parent = os.path.dirname(extraction_path)
+        while True:
+            staging = os.path.join(parent, f"{STAGING_PREFIX}{staging_host()}-{os.getpid()}-{os.urandom(4).hex()}")
+            try:
+                os.mkdir(staging)
+                return staging
+            except FileExistsError:
+                continue
+    
+    def publish_staging_dir(self, staging, extraction_path):
+        """Move a finished extraction from its staging folder to a free name; returns that name"""
+        # Workers run concurrently, so the name is claimed with mkdir right before
+        # the rename and a crash can't leave an empty data/ that pushes the next run to data_1
+        claimed = self.folders.claim(extraction_path)
+        try:
+            if platform.system() == "Windows":
+                # Windows can't rename over a directory, even an empty one
+                os.rmdir(claimed)
+            os.rename(staging, claimed)
         except OSError:
-            pass
+            if os.path.isdir(claimed) and not os.listdir(claimed):
+                os.rmdir(claimed)
+            raise
+        return claimed
+    
+    def sweep_staging_dir(self, staging):
+        """Delete a staging folder the scan found if the process that made it died"""
+        # Runs while the scan lists the parent, so leftovers are gone before the
+        # archives next to them are extracted or their disk space is reserved
+        if is_stale_staging(os.path.basename(staging)):
+            shutil.rmtree(staging, ignore_errors=True)
+            self.stale_staging_removed.increment()
+    
+    def collect_extracted_files(self, extraction_path, manifest=None):
+        """Collect all files from extraction directory as (relative path, size) pairs"""
+        # Engines report (relative path, size) as they write; only when one
+        # couldn't is the output walked again
+        if not manifest:
+            manifest = self.walk_extracted_files(extraction_path)
         
+        # A member stored twice is written twice but exists once
+        extracted_files = list(dict(manifest).items())
+        total_size = sum(size for relative_path, size in extracted_files)
         return extracted_files, total_size
     
+    def walk_extracted_files(self, extraction_path):
+        """Build a manifest by scanning the output folder in parallel"""
+        scanner = ArchiveScanner(workers=self.scan_workers)
+        prefix = os.path.join(extraction_path, '')
+        manifest = []
+        for directory, entries in scanner.walk(extraction_path):
+            for entry in entries:
+                try:
+                    # DirEntry caches its stat result, so each file costs at most one call
+                    manifest.append((entry.path[len(prefix):], entry.stat().st_size))
+                except OSError:
+                    continue
+        return manifest
+    
     def extract_with_patool(self, archive_path, extraction_path, password=None):
         """Extract archive using patool (handles most formats)"""
         try:
             import patoolib
-            # Create extraction directory
-            os.makedirs(extraction_path, exist_ok=True)
-            
+        except ImportError:
+            return False, "patool not installed (pip install patool)"
+        
+        # Create extraction directory
+        os.makedirs(extraction_path, exist_ok=True)
+        try:
             if password:
-                # Try with password first
-                try:
-                    patoolib.extract_archive(archive_path, outdir=extraction_path, password=password)
-                    return True, "Success"
-                except patoolib.util.PatoolError:
-                    # If password fails, try without (some archives might not need it)
-                    try:
-                        patoolib.extract_archive(archive_path, outdir=extraction_path)
-                        return True, "Success"
-                    except patoolib.util.PatoolError as e:
-                        error_msg = str(e)
-                        if 'password' in error_msg.lower() or 'encrypted' in error_msg.lower():
-                            self.password_protected += 1
-                            return False, "Password required or incorrect password"
-                        else:
-                            return False, error_msg
+                patoolib.extract_archive(archive_path, outdir=extraction_path, password=password)
             else:
                 patoolib.extract_archive(archive_path, outdir=extraction_path)
-                return True, "Success"
-                
+            return True, "Success"
         except patoolib.util.PatoolError as e:
             error_msg = str(e)
-            if 'password' in error_msg.lower() or 'encrypted' in error_msg.lower():
-                self.password_protected += 1
+        except Exception as e:
+            return False, str(e)
+        
+        # patool wraps whichever tool it ran, so its message is all there is to go on;
+        # each failure is classified once instead of re-running the extraction to find out
+        kind, error_msg = self.classify_patool_error(error_msg)
+        if kind == 'no-password-option' and password:
+            # The one failure a retry can fix: this format's tool takes no password.
+            # The retry starts from an empty folder so no partial output is mixed in
+            shutil.rmtree(extraction_path, ignore_errors=True)
+            return self.extract_with_patool(archive_path, extraction_path)
+        if kind == 'password':
+            self.password_protected.increment()
+            return False, "Password required or incorrect password"
+        if kind == 'corrupt':
+            return False, f"Corrupt archive: {error_msg}"
+        if kind == 'unsupported':
+            return False, f"Unsupported by patool: {error_msg}"
+        return False, error_msg
+    
+    def classify_patool_error(self, error_msg):
+        """Sort a patool failure into 'no-password-option', 'password', 'corrupt', 'unsupported' or None"""
+        # Returns (kind, message); the message never carries the command line or its password
+        command = self.PATOOL_COMMAND.search(error_msg)
+        if command:
+            # The first element of the command list (or shell string) is the program
+            program = re.match(r"[\[\s'\"]*([^'\",\s\]]*)", command.group(1)).group(1)
+            program = os.path.splitext(os.path.basename(program))[0].lower()
+            exit_code = int(command.group(2))
+            return (self.PATOOL_EXIT_CODES.get((program, exit_code)),
+                    f"{program or 'patool'} exited with code {exit_code}")
+        
+        text = re.sub(r"`[^']*'", "", error_msg)
+        for pattern, kind in self.PATOOL_FAILURES:
+            if pattern.search(text):
+                return kind, error_msg
+        return None, error_msg
+    
+    def extract_with_zipfile(self, archive_path, extraction_path, password=None, manifest=None):
+        """Extract ZIP archives in-process with zipfile (no subprocess spawn)"""
+        # (None, reason) means zipfile can't handle the archive and the next engine should try
+        encrypted = []
+        try:
+            zf = zipfile.ZipFile(archive_path)
+        except (zipfile.BadZipFile, OSError) as e:
+            # Damaged or unusual archives may still open in 7-Zip
+            return None, f"zipfile cannot read archive: {e}"
+        
+        try:
+            members = zf.infolist()
+            if any(info.compress_type == ZIP_AES_METHOD for info in members):
+                try:
+                    import pyzipper
+                except ImportError:
+                    return None, "AES-encrypted ZIP (install pyzipper for in-process support)"
+                zf.close()
+                zf = pyzipper.AESZipFile(archive_path)
+                members = zf.infolist()
+            
+            supported = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA, ZIP_AES_METHOD}
+            for info in members:
+                if info.compress_type not in supported:
+                    return None, f"Compression method {info.compress_type} not supported by zipfile"
+                if info.flag_bits & 0x40:
+                    return None, "Strong encryption not supported by zipfile"
+            
+            encrypted = [info for info in members if info.flag_bits & 0x1]
+            if encrypted and not password:
+                self.password_protected.increment()
                 return False, "Password required or incorrect password"
-            else:
-                return False, error_msg
+            encrypted_size = sum(info.file_size for info in encrypted if info.compress_type != ZIP_AES_METHOD)
+            if encrypted_size > ZIPCRYPTO_INPROCESS_LIMIT and self.find_7zip_executable():
+                return None, "Large ZipCrypto archive is faster in 7-Zip"
+            
+            pwd = password.encode('utf-8') if password else None
+            created = set()
+            for info in members:
+                relative_path = safe_member_path("", info.filename)
+                if relative_path is None:
+                    continue
+                target = os.path.join(extraction_path, relative_path)
+                if info.is_dir():
+                    if target not in created:
+                        os.makedirs(target, exist_ok=True)
+                        created.add(target)
+                    continue
+                
+                parent = os.path.dirname(target)
+                if parent not in created:
+                    os.makedirs(parent, exist_ok=True)
+                    created.add(parent)
+                
+                # Members are streamed in large chunks, so memory stays bounded
+                # even for multi-GB Zip64 entries
+                with zf.open(info, pwd=pwd) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                self.restore_zip_metadata(info, target)
+                if manifest is not None:
+                    manifest.append((relative_path, info.file_size))
+            
+            return True, "Success"
+        
+        except RuntimeError as e:
+            if 'password' in str(e).lower() or 'encrypted' in str(e).lower():
+                self.password_protected.increment()
+                return False, "Wrong password or encrypted archive"
+            return False, str(e)
+        except NotImplementedError as e:
+            return None, f"zipfile: {e}"
+        except (zipfile.BadZipFile, EOFError, ValueError) as e:
+            # With ZipCrypto a wrong password passes the 1-byte check 1 time in 256
+            # and then shows up as a CRC or decompression error
+            if password and encrypted:
+                self.password_protected.increment()
+                return False, "Wrong password or encrypted archive"
+            return False, f"Corrupt archive: {e}"
+        except Exception as e:
+            return False, str(e)
+        finally:
+            zf.close()
+    
+    def extract_with_tarfile(self, archive_path, extraction_path, password=None, fmt=None, manifest=None):
+        """Extract tar archives in one streaming pass (decompress and untar together)"""
+        # (None, reason) means tarfile can't read the archive and the next engine should try
+        started = time.perf_counter()
+        written = 0
+        skipped = 0
+        try:
+            with open(archive_path, 'rb', buffering=COPY_BUFFER_SIZE) as raw:
+                stream, process, mode = raw, None, 'r|*'
+                if fmt == 'zst' or self.archive_suffix(archive_path) in ZSTD_TAR_SUFFIXES:
+                    stream, process = self.open_zstd_stream(archive_path, raw)
+                    if stream is None:
+                        return None, "No zstd decoder (Python 3.14, zstandard or the zstd tool)"
+                    mode = 'r|'
+                
+                try:
+                    # Stream modes read the archive strictly sequentially, so compressed
+                    # tars never leave an intermediate .tar on disk
+                    with tarfile.open(fileobj=stream, mode=mode, bufsize=COPY_BUFFER_SIZE,
+                                      copybufsize=COPY_BUFFER_SIZE) as tf:
+                        for member in tf:
+                            if not self.safe_tar_member(member):
+                                skipped += 1
+                                continue
+                            try:
+                                if hasattr(tarfile, 'data_filter'):
+                                    tf.extract(member, extraction_path, filter='data')
+                                else:
+                                    tf.extract(member, extraction_path)
+                            except tarfile.FilterError:
+                                skipped += 1
+                                continue
+                            if member.isfile():
+                                written += member.size
+                                if manifest is not None:
+                                    # Same leading-slash stripping as the 'data' filter
+                                    manifest.append((os.path.normpath(member.name.lstrip('/')), member.size))
+                finally:
+                    if process:
+                        process.stdout.close()
+                        process.wait()
+                if process and process.returncode != 0:
+                    return False, f"zstd decoder failed (code {process.returncode})"
+        except (tarfile.ReadError, tarfile.CompressionError) as e:
+            if written:
+                return False, f"Corrupt archive: {e}"
+            return None, f"tarfile cannot read archive: {e}"
+        except (EOFError, tarfile.StreamError, zlib.error, lzma.LZMAError, ValueError) as e:
+            return False, f"Corrupt archive: {e}"
         except Exception as e:
             return False, str(e)
+        
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        read = self.get_archive_size(archive_path)
+        message = (f"Success ({self.format_size(written / elapsed)}/s written, "
+                   f"{self.format_size(read / elapsed)}/s read)")
+        if skipped:
+            message += f", skipped {skipped} unsafe entries"
+        return True, message
+    
+    def open_zstd_stream(self, archive_path, raw):
+        """Get a decompressed view of a .tar.zst as (stream, decoder process or None)"""
+        try:
+            from compression import zstd  # Python 3.14+
+            return zstd.ZstdFile(raw), None
+        except ImportError:
+            pass
+        try:
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(raw, read_size=COPY_BUFFER_SIZE), None
+        except ImportError:
+            pass
+        
+        # Pipe through an external decoder; the tar stream still never touches disk
+        for cmd in (["zstd", "-dcq", archive_path], [self.find_7zip_executable(), "e", "-so", "-tzstd", archive_path]):
+            if cmd[0] and shutil.which(cmd[0]):
+                try:
+                    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                               bufsize=COPY_BUFFER_SIZE)
+                    return process.stdout, process
+                except OSError:
+                    continue
+        return None, None
+    
+    def safe_tar_member(self, member):
+        """Reject entries that could escape the extraction folder on old Pythons"""
+        if hasattr(tarfile, 'data_filter'):
+            # The 'data' extraction filter already enforces this
+            return True
+        if member.issym() or member.islnk() or member.isdev():
+            return False
+        return safe_member_path("", member.name) == os.path.normpath(member.name)
+    
+    def restore_zip_metadata(self, info, target):
+        """Apply the member's modification time and executable bits"""
+        try:
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            os.utime(target, (mtime, mtime))
+        except (OverflowError, ValueError, OSError):
+            pass
+        mode = (info.external_attr >> 16) & 0o777
+        if info.create_system == 3 and mode & 0o111 and platform.system() != "Windows":
+            try:
+                os.chmod(target, mode)
+            except OSError:
+                pass
     
     def get_7zip_paths(self):
         """Get 7-Zip executable paths for current platform"""
@@ -175,174 +2014,713 @@ class ArchiveExtractor:
                 "C:\\Program Files\\7-Zip\\7z.exe",
                 "C:\\Program Files (x86)\\7-Zip\\7z.exe",
                 "7z.exe",
+                "7za.exe",
                 "7z"
             ]
         else:  # Linux, macOS, etc.
             return [
+                "/usr/bin/7zz",
                 "/usr/bin/7z",
                 "/usr/bin/7za",
+                "/usr/local/bin/7zz",
                 "/usr/local/bin/7z",
                 "/usr/local/bin/7za",
+                "/opt/homebrew/bin/7zz",
+                "/opt/homebrew/bin/7z",
+                "7zz",
+                "7zzs",
                 "7z",
                 "7za"
             ]
     
     def find_7zip_executable(self):
-        """Find 7-Zip executable in system"""
-        seven_zip_paths = self.get_7zip_paths()
+        """Find 7-Zip executable in system (located once per run)"""
+        with self.seven_zip_lock:
+            if not self.seven_zip_located:
+                self.seven_zip = SevenZipLocator(self.get_7zip_paths()).locate()
+                self.seven_zip_located = True
+        return self.seven_zip[0] if self.seven_zip else None
+    
+    def extract_with_7zip(self, archive_path, extraction_path, password=None, manifest=None, info=None):
+        """Extract using 7-Zip command line (most reliable)"""
+        seven_zip_exe = self.find_7zip_executable()
         
-        for path in seven_zip_paths:
-            # Check if path exists
-            if os.path.exists(path):
-                return path
-            
-            # Check if command is in PATH
+        if not seven_zip_exe:
+            return False, "7-Zip not found. Please install 7-Zip/p7zip"
+        
+        driver = SevenZipDriver(seven_zip_exe, self.seven_zip[1])
+        archive_name = os.path.basename(archive_path)
+        progress = ProgressReporter(self.console, archive_name)
+        written = []
+        
+        def on_line(line):
+            # -bb1 prints "- name" for every item it writes
+            if line.startswith('- '):
+                written.append(line[2:])
+        
+        try:
+            driver.extract(archive_path, extraction_path, password, on_progress=progress.update, on_line=on_line)
+            if manifest is not None:
+                self.manifest_from_7zip(extraction_path, manifest, written, info)
+            return True, "Success"
+        except SevenZipWarning as e:
+            # Exit code 1: the archive was extracted but some entries had problems,
+            # so the listing can't be trusted and only the written names are used
+            if manifest is not None:
+                self.manifest_from_7zip(extraction_path, manifest, written, None)
+            return True, f"Success with warnings: {e.detail or 'see 7-Zip output'}"
+        except SevenZipPasswordError:
+            self.password_protected.increment()
+            return False, SevenZipPasswordError.summary
+        except (SevenZipCorruptError, SevenZipUnsupportedError) as e:
+            return False, e.describe()
+        except SevenZipFatalError as e:
+            return False, f"7-Zip error (code {e.exit_code}): {e}"
+        except SevenZipError as e:
+            return False, e.describe()
+        except OSError as e:
+            return False, str(e)
+    
+    def manifest_from_7zip(self, extraction_path, manifest, written, info):
+        """Fill the manifest from the probe listing or the names 7-Zip printed"""
+        if info is not None and info.files and all(name for name, size in info.files):
+            for name, size in info.files:
+                relative_path = safe_member_path("", name)
+                if relative_path is not None:
+                    manifest.append((relative_path, size))
+            return
+        
+        entries = []
+        for name in written:
             try:
-                if platform.system() == "Windows":
-                    result = subprocess.run([path, "--help"], capture_output=True, timeout=5, check=False)
-                else:
-                    result = subprocess.run([path, "--help"], capture_output=True, timeout=5, check=False)
-                
-                if result.returncode in [0, 1]:  # 7z returns 1 for --help on some systems
-                    return path
-            except (subprocess.TimeoutExpired, FileNotFoundError, PermissionError):
-                continue
+                st = os.lstat(os.path.join(extraction_path, name))
+            except OSError:
+                # A name that doesn't map back to a file (old 7-Zip without
+                # -scc, renamed entries) leaves the manifest to the walk
+                return
+            if not stat.S_ISDIR(st.st_mode):
+                entries.append((os.path.normpath(name), st.st_size))
+        manifest.extend(entries)
+    
+    def probe_archive(self, archive_path, fmt=None, volumes=None, password=None):
+        """List an archive's contents without extracting it (None if it can't be listed cheaply)"""
+        try:
+            if volumes is None and fmt in ZIPFILE_FORMATS:
+                return self.probe_zip(archive_path)
+            if volumes is None and fmt in ('tar', 'tar.gz'):
+                return self.probe_tar(archive_path, fmt)
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError, ValueError):
+            return None
         
-        return None
+        size = volumes.size if volumes else self.get_archive_size(archive_path)
+        if fmt in TARFILE_FORMATS or size < PROBE_MIN_SIZE:
+            return None
+        return self.probe_with_7zip(archive_path, password)
     
-    def extract_with_7zip(self, archive_path, extraction_path, password=None):
-        """Extract using 7-Zip command line (most reliable)"""
+    def verify_password(self, archive_path, password, fmt=None, volumes=None, info=None):
+        """Check a password by decrypting as little as possible (None if it can't be checked cheaply)"""
+        if not password or info is None or not info.encrypted:
+            return None
+        if info.headers_encrypted:
+            # Decrypting the headers is the whole test, and a listing does just that
+            listed = self.probe_with_7zip(archive_path, password)
+            if listed is None:
+                return None
+            return not listed.headers_encrypted
+        if info.smallest_encrypted is None:
+            return None
+        
+        name = info.smallest_encrypted[0]
+        if volumes is None and fmt in ZIPFILE_FORMATS:
+            verified = self.verify_zip_password(archive_path, password, name)
+            if verified is not None:
+                return verified
+        return self.verify_with_7zip(archive_path, password, name)
+    
+    def verify_zip_password(self, archive_path, password, name):
+        """Decrypt one ZIP member in memory"""
+        zf = None
         try:
-            seven_zip_exe = self.find_7zip_executable()
-            
-            if not seven_zip_exe:
-                return False, "7-Zip not found. Please install 7-Zip/p7zip"
-            
-            # Build 7-Zip command
-            if platform.system() == "Windows":
-                cmd = [seven_zip_exe, "x", archive_path, f"-o{extraction_path}", "-y"]
-            else:
-                cmd = [seven_zip_exe, "x", archive_path, f"-o{extraction_path}", "-y"]
-            
-            if password:
-                cmd.extend([f"-p{password}"])
-            
-            # Run 7-Zip
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            if result.returncode == 0:
-                return True, "Success"
-            else:
-                error_output = result.stderr.lower() + result.stdout.lower()
-                if "wrong password" in error_output or "encrypted" in error_output:
-                    self.password_protected += 1
-                    return False, "Wrong password or encrypted archive"
-                elif "not supported" in error_output:
-                    return False, "Compression method not supported"
-                else:
-                    return False, f"7-Zip error (code {result.returncode}): {result.stderr}"
-                    
-        except subprocess.TimeoutExpired:
-            return False, "Extraction timed out"
-        except Exception as e:
-            return False, str(e)
+            zf = zipfile.ZipFile(archive_path)
+            if zf.getinfo(name).compress_type == ZIP_AES_METHOD:
+                import pyzipper
+                zf.close()
+                zf = pyzipper.AESZipFile(archive_path)
+            # Reading to the end checks the CRC, which catches the wrong
+            # ZipCrypto passwords that pass the 1-byte header check
+            with zf.open(name, pwd=password.encode('utf-8')) as member:
+                while member.read(COPY_BUFFER_SIZE):
+                    pass
+            return True
+        except RuntimeError as e:
+            return False if 'password' in str(e).lower() else None
+        except (zipfile.BadZipFile, zlib.error, lzma.LZMAError, EOFError, ValueError):
+            return False
+        except (ImportError, KeyError, NotImplementedError, OSError):
+            return None
+        finally:
+            if zf is not None:
+                zf.close()
     
-    def extract_archive(self, archive_path, password_policy, current_password=None):
-        """Extract a single archive file"""
-        archive_name = os.path.basename(archive_path)
-        extraction_path = self.get_extraction_path(archive_path)
-        archive_size = self.get_archive_size(archive_path)
+    def verify_with_7zip(self, archive_path, password, name):
+        """Run 7-Zip's test mode on a single entry"""
+        seven_zip_exe = self.find_7zip_executable()
+        if not seven_zip_exe:
+            return None
+        
+        nothing_tested = []
+        
+        def on_line(line):
+            if line.startswith("No files to process"):
+                nothing_tested.append(line)
+        
+        try:
+            SevenZipDriver(seven_zip_exe, self.seven_zip[1]).test(archive_path, password, [name], on_line)
+        except SevenZipPasswordError:
+            return False
+        except (SevenZipError, OSError):
+            return None
+        # A name 7-Zip didn't match proves nothing either way
+        return None if nothing_tested else True
+    
+    def probe_zip(self, archive_path):
+        """Read sizes, methods and encryption flags from the ZIP central directory"""
+        info = ArchiveInfo()
+        with zipfile.ZipFile(archive_path) as zf:
+            for member in zf.infolist():
+                info.add_entry(member.filename, member.file_size, member.is_dir(), bool(member.flag_bits & 0x1),
+                               ZIP_METHOD_NAMES.get(member.compress_type, str(member.compress_type)),
+                               member.compress_size)
+        return info
+    
+    def probe_tar(self, archive_path, fmt):
+        """Walk plain tar headers, or estimate a .tar.gz from its gzip trailer"""
+        info = ArchiveInfo()
+        if fmt == 'tar.gz':
+            # ISIZE holds the uncompressed size modulo 4 GiB; the entries stay unknown
+            info.files = None
+            isize = int.from_bytes(read_tail(archive_path, 4), 'little')
+            if isize >= self.get_archive_size(archive_path):
+                info.uncompressed_size = isize
+            return info
+        
+        with tarfile.open(archive_path, 'r:') as tf:
+            while True:
+                member = tf.next()
+                if member is None:
+                    break
+                info.add_entry(member.name, member.size, not member.isfile())
+                # Headers are only needed once, so don't let tarfile keep them all
+                tf.members.clear()
+        return info
+    
+    def probe_with_7zip(self, archive_path, password=None):
+        """Parse 7-Zip's technical listing as it streams"""
+        seven_zip_exe = self.find_7zip_executable()
+        if not seven_zip_exe:
+            return None
+        
+        info = ArchiveInfo()
+        entry = {}
+        in_entries = [False]
+        
+        def add_entry():
+            is_dir = entry.get('Folder') == '+' or entry.get('Attributes', '').startswith('D')
+            info.add_entry(entry.get('Path', ''), int(entry.get('Size') or 0), is_dir,
+                           entry.get('Encrypted') == '+', entry.get('Method'), int(entry.get('Packed Size') or 0))
+            entry.clear()
+        
+        def on_line(line):
+            if line.startswith('----------'):
+                in_entries[0] = True
+                return
+            key, separator, value = line.partition(' = ')
+            if not separator:
+                return
+            if not in_entries[0]:
+                if key == 'Solid' and value == '+':
+                    info.solid = True
+                return
+            if key == 'Path' and entry:
+                add_entry()
+            entry[key] = value
+        
+        try:
+            SevenZipDriver(seven_zip_exe, self.seven_zip[1]).list(archive_path, password, on_line=on_line)
+        except SevenZipPasswordError:
+            # Without the password even the file names are hidden
+            info.encrypted = True
+            info.headers_encrypted = True
+            info.files = None
+            return info
+        except (SevenZipError, OSError, ValueError):
+            return None
+        if entry:
+            add_entry()
+        return info
+    
+    def extract_with_engines(self, archive_path, extraction_path, password=None, fmt=None, volumes=None,
+                             manifest=None, info=None):
+        """Try extraction engines from the cheapest capable one to the most general"""
+        if fmt is None and volumes is None:
+            fmt = self.format_from_suffix(archive_path)
+        
+        if volumes is not None:
+            # Only 7-Zip (or patool) follows a volume set from its first part
+            pass
+        elif fmt in ZIPFILE_FORMATS:
+            # Method 1: In-process zipfile avoids a process spawn per archive
+            success, message = self.extract_with_zipfile(archive_path, extraction_path, password, manifest)
+            if success is not None:
+                return success, message
+        elif fmt in TARFILE_FORMATS:
+            # Method 1: Streaming tarfile handles compound formats in a single pass;
+            # plain compressed files fall through to 7-Zip
+            success, message = self.extract_with_tarfile(archive_path, extraction_path, password, fmt, manifest)
+            if success is not None:
+                return success, message
+        
+        # Method 2: 7-Zip (most reliable)
+        success, message = self.extract_with_7zip(archive_path, extraction_path, password, manifest, info)
+        
+        if not success and "7-Zip not found" in message:
+            # Method 3: Fall back to patool if 7-Zip not available
+            success, message = self.extract_with_patool(archive_path, extraction_path, password)
+        
+        return success, message
+    
+    def format_from_suffix(self, archive_path):
+        """Guess the format from the file name when no header was sniffed"""
+        suffix = self.archive_suffix(archive_path)
+        # Plain .gz/.xz may still wrap a tar, so let tarfile have a look
+        return {
+            '.zip': 'zip', '.rar': 'rar', '.7z': '7z', '.tar': 'tar',
+            '.tar.gz': 'tar.gz', '.tgz': 'tar.gz', '.gz': 'tar.gz',
+            '.tar.xz': 'tar.xz', '.txz': 'tar.xz', '.xz': 'tar.xz',
+            '.tar.bz2': 'bz2', '.tbz2': 'bz2', '.tbz': 'bz2', '.bz2': 'bz2',
+            '.tar.zst': 'zst', '.tzst': 'zst',
+        }.get(suffix)
+    
+    def extract_archive(self, archive_path, password_policy, current_password=None, fmt=None, volumes=None):
+        """Extract a single archive file (or the first volume of a volume set)"""
+        archive_name = volumes.name if volumes else os.path.basename(archive_path)
+        archive_size = volumes.size if volumes else self.get_archive_size(archive_path)
+        try:
+            archive_mtime_ns = volumes.mtime_ns if volumes else os.stat(archive_path).st_mtime_ns
+        except OSError:
+            archive_mtime_ns = None
+        if fmt is None and volumes is None:
+            fmt = self.format_from_suffix(archive_path)
+        
+        if volumes and volumes.missing:
+            # Nothing is spawned for a set that can't be complete
+            return self.report_not_extracted(
+                archive_path, archive_size, archive_mtime_ns, volumes,
+                f"Incomplete volume set, missing {', '.join(volumes.missing)}",
+                f"{archive_name} ({self.format_size(archive_size)}, {len(volumes)} parts found)"
+            )
+        
+        prepared = self.prepared_passwords.pop(archive_path, None)
+        if prepared and prepared[0] is None:
+            # The pre-flight already counted it, so nothing is probed or spawned
+            return self.report_not_extracted(
+                archive_path, archive_size, archive_mtime_ns, volumes,
+                "Password protected (skipped at the prompt)",
+                f"{archive_name} ({self.format_size(archive_size)})"
+            )
+        
+        # Learn sizes and encryption before anything is written
+        if prepared:
+            current_password, info = prepared
+            if info.files is None:
+                # Only the encrypted headers were seen; list them with the password
+                info = self.probe_archive(archive_path, fmt, volumes, current_password) or info
+        else:
+            info = self.probe_archive(archive_path, fmt, volumes, current_password)
+        if info and info.encrypted and password_policy == 'skip_all':
+            self.password_protected.increment()
+            return self.report_not_extracted(
+                archive_path, archive_size, archive_mtime_ns, volumes,
+                "Password protected (skipped by policy)",
+                f"{archive_name} ({self.format_size(archive_size)})"
+            )
+        
+        reservation = None
+        if info and info.uncompressed_size:
+            reservation, available = self.disk_space.reserve(os.path.dirname(archive_path) or os.curdir,
+                                                             info.uncompressed_size)
+            if reservation is None:
+                return self.report_not_extracted(
+                    archive_path, archive_size, archive_mtime_ns, volumes,
+                    f"Not enough disk space: needs {self.format_size(info.uncompressed_size)}, "
+                    f"{self.format_size(max(available, 0))} available",
+                    f"{archive_name} ({self.format_size(archive_size)})"
+                )
         
-        print(f"\n📦 Extracting: {archive_name} ({self.format_size(archive_size)})")
-        print(f"   Destination: {extraction_path}")
+        try:
+            return self.extract_probed_archive(archive_path, archive_name, archive_size, archive_mtime_ns,
+                                               password_policy, current_password, fmt, volumes, info,
+                                               confirmed=prepared is not None)
+        finally:
+            if reservation:
+                self.disk_space.release(reservation)
+    
+    def extract_probed_archive(self, archive_path, archive_name, archive_size, archive_mtime_ns,
+                               password_policy, current_password, fmt, volumes, info, confirmed=False):
+        """Run the extraction engines for an archive that passed its pre-checks"""
+        extraction_path = self.get_extraction_path(archive_path, archive_name)
         
-        # Handle password
+        # Output is collected and written as one block once the archive is done
+        destination = f"   Destination: {extraction_path}"
+        log = [
+            f"\n📦 Extracting: {archive_name} ({self.format_size(archive_size)})",
+            destination
+        ]
+        if volumes:
+            log.insert(1, f"   Volumes: {len(volumes)} parts starting at {os.path.basename(archive_path)}")
+        if info and info.describe(self.format_size):
+            log.insert(1, f"   🔍 Contents: {info.describe(self.format_size)}")
+        
+        # Handle password; nothing is asked here, the ask_each pre-flight did that
         password = current_password
-        max_attempts = 3
-        attempts = 0
-        
-        while attempts < max_attempts:
-            # If we don't have a password and policy is ask_each, ask for it
-            if password_policy == 'ask_each' and not password:
-                use_password = input(f"Does '{archive_name}' require a password? (y/N): ").strip().lower()
-                if use_password == 'y':
-                    password = input(f"Enter password for '{archive_name}': ").strip()
-                    self.password_protected += 1
-            
-            # Try extraction methods in order of reliability
-            success = False
-            message = "Extraction failed"
-            
-            # Method 1: Try 7-Zip first (most reliable)
-            success, message = self.extract_with_7zip(archive_path, extraction_path, password)
-            
-            if not success and "7-Zip not found" in message:
-                # Method 2: Fall back to patool if 7-Zip not available
-                success, message = self.extract_with_patool(archive_path, extraction_path, password)
+        # A password the pre-flight or the known-password search already checked
+        # is not checked again (with encrypted headers each check is a full listing)
+        checked = password if confirmed else None
+        rejected = None
+        searched = confirmed
+        if info and info.encrypted and password_policy != 'skip_all' and not confirmed:
+            searched = True
+            known = self.find_known_password(archive_path, fmt, volumes, info, current_password)
+            if known:
+                password = checked = known
+            else:
+                # The search only passes over a password its check proved wrong
+                rejected = current_password
+        
+        while True:
+            manifest = []
+            # A wrong password is caught on the smallest encrypted entry instead
+            # of after a full extraction
+            if password and (password == rejected or (password != checked and
+                                 self.verify_password(archive_path, password, fmt, volumes, info) is False)):
+                self.password_protected.increment()
+                success, message = False, "Wrong password (checked before extracting)"
+            else:
+                success, message, published = self.extract_staged(archive_path, extraction_path, password, fmt,
+                                                                   volumes, manifest, info)
+                if success:
+                    # The wanted name may have been taken by then; data_1 is shown instead
+                    extraction_path = published
+                    log[log.index(destination)] = f"   Destination: {extraction_path}"
             
             if success:
                 break
-            elif "password" in message.lower() and password_policy == 'ask_each' and attempts < max_attempts - 1:
-                print(f"   ❌ Failed: {message}")
-                password = input(f"Enter password for '{archive_name}' (attempt {attempts + 2}/{max_attempts}): ").strip()
-                attempts += 1
-                continue
-            else:
-                break
-        
-        # Clean up empty extraction directory if extraction failed
-        if not success:
-            try:
-                if os.path.exists(extraction_path) and not os.listdir(extraction_path):
-                    os.rmdir(extraction_path)
-            except OSError:
-                pass
+            
+            if "password" in message.lower() and not searched and password_policy != 'skip_all':
+                # Encryption only showed up now; list the archive so known passwords can be checked cheaply
+                searched = True
+                if not (info and info.encrypted):
+                    info = self.probe_with_7zip(archive_path) or info
+                known = self.find_known_password(archive_path, fmt, volumes, info)
+                if known and known != password:
+                    log.append(f"   ❌ Failed: {message}")
+                    password = checked = known
+                    continue
+            break
         
         # Record result
         result = {
             'path': archive_path,
+            'volumes': len(volumes) if volumes else 1,
             'success': success,
             'message': message,
             'size': archive_size,
             'extraction_path': extraction_path if success else None
         }
+        if info and info.files is not None:
+            result['entries'] = info.entry_count
         
         if success:
-            extracted_files, total_size = self.collect_extracted_files(extraction_path)
-            result['extracted_files'] = extracted_files
+            if password:
+                self.remember_password(archive_path, volumes, password)
+            extracted_files, total_size = self.collect_extracted_files(extraction_path, manifest)
             result['extracted_size'] = total_size
             result['file_count'] = len(extracted_files)
-            self.all_extracted_files.extend(extracted_files)
-            self.successful_extractions += 1
-            print(f"   ✅ Success: {message}")
-            print(f"   📁 Extracted {len(extracted_files)} files ({self.format_size(total_size)})")
-            self.extraction_results['success'].append(result)
+            self.all_extracted_files.extend(extraction_path, extracted_files)
+            self.successful_extractions.increment()
+            log.append(f"   ✅ Success: {message}")
+            log.append(f"   📁 Extracted {len(extracted_files)} files ({self.format_size(total_size)})")
         else:
-            self.failed_extractions += 1
-            print(f"   ❌ Failed: {message}")
-            self.extraction_results['failed'].append(result)
+            self.failed_extractions.increment()
+            log.append(f"   ❌ Failed: {message}")
         
-        self.extraction_results['all'].append(result)
+        self.extraction_results.add(result)
+        self.record_outcome(archive_path, archive_size, archive_mtime_ns, success, message, extraction_path)
+        self.write_archive_log(log)
         return success
     
-    def extract_all_archives(self, directory, recursive=True, password_policy='ask_each'):
-        """Extract all archives in the directory"""
-        archives = self.find_archives(directory, recursive)
-        self.total_archives = len(archives)
-        
-        if not archives:
-            print("❌ No supported archive files found!")
+    def extract_staged(self, archive_path, extraction_path, password, fmt, volumes, manifest, info):
+        """Run the engines in a fresh staging folder and publish it on success; returns (success, message, folder)"""
+        # Each attempt writes into its own staging folder, so a failed or
+        # interrupted one never leaves partial output (or an empty claimed folder) behind
+        staging = None
+        published = None
+        try:
+            staging = self.make_staging_dir(extraction_path)
+            success, message = self.extract_with_engines(archive_path, staging, password, fmt, volumes,
+                                                         manifest, info)
+            if success:
+                published = self.publish_staging_dir(staging, extraction_path)
+        except OSError as e:
+            # A read-only or full destination fails this archive, not the run
+            if staging is None:
+                success, message = False, f"Could not create staging folder: {e}"
+            else:
+                success, message = False, f"Could not move output into place: {e}"
+        finally:
+            if staging and os.path.isdir(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+        return success, message, published
+    
+    def report_not_extracted(self, archive_path, archive_size, archive_mtime_ns, volumes, message, heading):
+        """Record an archive that was turned away before extraction as one failed result"""
+        self.failed_extractions.increment()
+        self.extraction_results.add({
+            'path': archive_path,
+            'volumes': len(volumes) if volumes else 1,
+            'success': False,
+            'message': message,
+            'size': archive_size,
+            'extraction_path': None
+        })
+        self.record_outcome(archive_path, archive_size, archive_mtime_ns, False, message, None)
+        self.write_archive_log([
+            f"\n📦 Skipping: {heading}",
+            f"   ❌ Failed: {message}"
+        ])
+        return False
+    
+    def write_archive_log(self, log):
+        """Prefix an archive's output block with the run progress and print it"""
+        processed = self.processed_archives.increment()
+        scanning = "+" if self.scanning.is_set() else ""
+        log[0] = (f"\n[#{processed} | discovered: {self.total_archives}{scanning} | "
+                  f"extracted: {self.successful_extractions.value}] {log[0].lstrip()}")
+        self.console.write(log)
+    
+    def discover_archives(self, archives, pending, stop):
+        """Feed discovered archives into the bounded extraction queue"""
+        self.scanning.set()
+        try:
+            for item in archives:
+                self.total_archives += 1
+                if not self.put_until_stopped(pending, item, stop):
+                    break
+        except Exception as e:
+            self.discovery_error = e
+        finally:
+            archives.close()
+            self.scanning.clear()
+            self.put_until_stopped(pending, None, stop)
+    
+    def put_until_stopped(self, pending, item, stop):
+        """Block on a full queue, giving up once the run is stopped"""
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def record_outcome(self, archive_path, archive_size, archive_mtime_ns, success, message, extraction_path):
+        """Remember a final outcome in the scan index (transient failures are not stored)"""
+        if not self.index or archive_mtime_ns is None:
+            return
+        if success:
+            status = ScanIndex.EXTRACTED
+        elif "password" in message.lower():
+            status = ScanIndex.NEEDS_PASSWORD
+        elif message.startswith(SevenZipCorruptError.summary):
+            status = ScanIndex.FAILED_CORRUPT
+        else:
+            # Unsupported methods, missing tools and other 7-Zip failures depend on
+            # this machine, so those archives are tried again on the next run
             return
+        try:
+            self.index.record(os.path.abspath(archive_path), archive_size, archive_mtime_ns, status, message,
+                              extraction_path if success else None)
+        except sqlite3.Error:
+            pass
+    
+    def close(self):
+        """Release the scan index and the manifest database"""
+        if self.index:
+            self.index.close()
+            self.index = None
+        if self.manifest_db is not None:
+            self.manifest_db.close()
+            self.manifest_db = None
+    
+    def extraction_worker(self, pending, password_policy, current_password, stop):
+        """Take archives off the queue and extract them until discovery is done"""
+        while not stop.is_set():
+            try:
+                item = pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                # Leave the end marker in place for the other workers
+                self.put_until_stopped(pending, None, stop)
+                break
+            archive_path, fmt, volumes = item
+            self.extract_archive(archive_path, password_policy, current_password, fmt, volumes)
+    
+    def preflight_info(self, archive_path, fmt, volumes):
+        """Learn whether an archive is encrypted, reading headers before spawning anything"""
+        if volumes is None and fmt in ZIPFILE_FORMATS:
+            try:
+                # The general-purpose flag bit of every entry is in the central directory
+                return self.probe_zip(archive_path)
+            except (zipfile.BadZipFile, OSError, ValueError):
+                pass
+        elif fmt in TARFILE_FORMATS or fmt in ('gz', 'xz'):
+            return None
+        else:
+            flags = detect_encryption(archive_path, fmt)
+            if flags is not None and not flags[1]:
+                return None
+            if flags is not None and flags[0]:
+                info = ArchiveInfo()
+                info.encrypted = info.headers_encrypted = True
+                info.files = None
+                return info
+        # Encrypted data (or headers we can't read): the listing says which entry is cheapest to test
+        return self.probe_with_7zip(archive_path)
+    
+    def preflight_passwords(self, items):
+        """Find the encrypted archives and ask for all their passwords before extraction starts"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="preflight") as executor:
+            infos = list(executor.map(lambda item: self.preflight_info(*item), items))
+            encrypted = [(item, info) for item, info in zip(items, infos) if info and info.encrypted]
+            # Remembered and keyring passwords are tried first, for all archives at once
+            known = list(executor.map(lambda entry: self.find_known_password(*entry[0], entry[1]), encrypted))
         
-        print(f"\n🎯 Found {self.total_archives} archive files")
-        print("Starting extraction...")
+        # Nobody is asked per archive later, so the summary counts them here
+        self.password_protected.increment(len(encrypted))
+        unresolved = []
+        for (item, info), password in zip(encrypted, known):
+            if password:
+                self.prepared_passwords[item[0]] = (password, info)
+            else:
+                unresolved.append((item, info))
+        print(f"🔐 Pre-flight: checked {len(items)} archives in {time.perf_counter() - started:.1f}s, "
+              f"{len(encrypted)} encrypted, {len(encrypted) - len(unresolved)} unlocked with known passwords")
+        
+        typed = []
+        asked = 0
+        for index, ((archive_path, fmt, volumes), info) in enumerate(unresolved):
+            name = volumes.name if volumes else os.path.basename(archive_path)
+            # A password typed for one archive often opens the next one too
+            password = next((p for p in typed if self.verify_password(archive_path, p, fmt, volumes, info)), None)
+            if password is None:
+                # Only prompts actually shown are numbered; the total shrinks as typed passwords unlock others
+                asked += 1
+                label = f"{asked}/{asked + len(unresolved) - index - 1}"
+            attempts = 0
+            while password is None and attempts < 3:
+                attempts += 1
+                entered = input(f"Enter password for '{name}' ({label}, empty to skip): ").strip()
+                if not entered:
+                    break
+                if self.verify_password(archive_path, entered, fmt, volumes, info) is False:
+                    print("   ❌ Wrong password")
+                    continue
+                password = entered
+                typed.insert(0, entered)
+            self.prepared_passwords[archive_path] = (password, info)
+        if unresolved:
+            print("✅ All passwords collected, extraction runs unattended from here")
+    
+    def extract_all_archives(self, directory, recursive=True, password_policy='ask_each'):
+        """Extract archives while the directory scan is still discovering them"""
+        print(f"🔍 Searching for archive files in: {directory}")
+        print(f"Starting extraction with {self.jobs} parallel workers...")
         print("=" * 60)
         
         current_password = self.global_password if password_policy == 'use_global' else None
+        self.password_policy = password_policy
+        if self.use_index and not self.index:
+            try:
+                self.index = ScanIndex(self.index_path)
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️  Scan index unavailable, processing everything: {e}")
+        if self.manifest_path is not None and self.manifest_db is None:
+            try:
+                self.manifest_db = ExtractedFilesDatabase(self.manifest_path or None, directory)
+                self.all_extracted_files = self.manifest_db
+                print(f"🗄️  File manifest: {self.manifest_db.db_path} (run {self.manifest_db.run})")
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️  Manifest database unavailable, keeping the file list in memory: {e}")
+        
+        self.load_keyring()
+        
+        if self.find_7zip_executable():
+            path, version = self.seven_zip
+            print(f"🔧 Using 7-Zip {version}: {path}")
+        
+        # Discovery runs in the background and blocks once the queue is full,
+        # so memory stays flat however many archives the tree holds
+        scanner = self.make_scanner(recursive)
+        archives = self.iter_archives(scanner, directory)
+        if password_policy == 'ask_each':
+            # Prompting mid-run would stall the workers, so the whole tree is
+            # discovered and every password collected before extraction starts
+            items = list(archives)
+            self.preflight_passwords(items)
+            archives = (item for item in items)
+            password_policy = 'preflight'
+        
+        pending = queue.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+        stop = threading.Event()
+        self.discovery_error = None
+        self.scanning.set()
+        producer = threading.Thread(
+            target=self.discover_archives,
+            args=(archives, pending, stop),
+            name="discovery",
+            daemon=True
+        )
+        producer.start()
+        
+        # Each worker drives one extraction at a time; 7-Zip runs as a separate
+        # process and zlib/bz2/lzma release the GIL, so threads scale with cores
+        executor = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="extract")
+        try:
+            workers = [
+                executor.submit(self.extraction_worker, pending, password_policy, current_password, stop)
+                for _ in range(self.jobs)
+            ]
+            for worker in workers:
+                worker.result()
+        finally:
+            stop.set()
+            scanner.cancel()
+            producer.join()
+            executor.shutdown(wait=True)
         
-        for i, archive_path in enumerate(archives, 1):
-            print(f"\n[{i}/{self.total_archives}] ", end="")
-            self.extract_archive(archive_path, password_policy, current_password)
+        if self.discovery_error:
+            raise self.discovery_error
+        
+        print(f"\n{'='*60}")
+        self.report_scan(scanner)
+        if not self.total_archives and self.unchanged_skipped:
+            print("✅ No new or changed archives to extract")
+        elif not self.total_archives:
+            print("❌ No supported archive files found!")
+        else:
+            print(f"🎯 Found {self.total_archives} archive files")
     
     def ask_copy_files(self):
         """Ask user if they want to copy extracted files to a specific path"""
@@ -351,7 +2729,7 @@ class ArchiveExtractor:
             return False
         
         total_files = len(self.all_extracted_files)
-        total_size = sum(file['size'] for file in self.all_extracted_files)
+        total_size = self.all_extracted_files.total_size
         
         print(f"\n📋 Extraction completed! Found {total_files} files ({self.format_size(total_size)})")
         print("\nDo you want to copy all extracted files to a specific directory?")
@@ -363,17 +2741,31 @@ class ArchiveExtractor:
             choice = input("\nEnter your choice (1-3): ").strip()
             
             if choice == '1':
-                return self.copy_all_files()
+                return self.copy_all_files(self.ask_consolidation_mode())
             elif choice == '2':
                 print("Files will remain in their extraction folders.")
                 return False
             elif choice == '3':
-                return self.selective_copy()
+                return self.selective_copy(self.ask_consolidation_mode())
             else:
                 print("Invalid choice! Please enter 1, 2, or 3.")
     
-    def copy_all_files(self):
-        """Copy all extracted files to a user-specified directory"""
+    def ask_consolidation_mode(self):
+        """Ask how files should be placed in the target directory"""
+        print("\nHow should the files be placed there?")
+        print("1. Copy (keep the extracted files)")
+        print("2. Move (instant on the same drive, frees the extraction folders)")
+        print("3. Hard link (instant, no extra space, same drive only)")
+        print("4. Symbolic link (point at the extracted files)")
+        
+        while True:
+            choice = input("\nEnter your choice (1-4, default 1): ").strip() or '1'
+            if choice in ('1', '2', '3', '4'):
+                return ParallelCopier.MODES[int(choice) - 1]
+            print("Invalid choice! Please enter 1, 2, 3, or 4.")
+    
+    def ask_target_dir(self):
+        """Ask for the directory files are consolidated into (None if cancelled)"""
         target_dir = input("\nEnter the target directory path: ").strip()
         
         # Validate target directory
@@ -385,66 +2777,82 @@ class ArchiveExtractor:
                     print(f"✅ Created directory: {target_dir}")
                 except OSError as e:
                     print(f"❌ Failed to create directory: {e}")
-                    return False
+                    return None
             else:
                 print("Copy operation cancelled.")
-                return False
+                return None
         
         if not os.path.isdir(target_dir):
             print(f"❌ '{target_dir}' is not a directory!")
-            return False
+            return None
         
-        print(f"\n📤 Copying {len(self.all_extracted_files)} files to: {target_dir}")
+        return target_dir
+    
+    def copy_jobs(self, files, target_dir):
+        """Pair each file with a free name in target_dir"""
+        # Handle duplicate filenames, including ones still being copied
+        names = NameAllocator(target_dir)
+        for file_info in files:
+            yield file_info.path, names.allocate(os.path.basename(file_info.path)), file_info.size
+    
+    def copy_files(self, files, total, target_dir, mode='copy'):
+        """Copy, move or link files into target_dir in parallel and return the finished copier"""
+        print(f"\n📤 {self.MODE_VERBS[mode][0]} {total} files to: {target_dir}")
         print("=" * 60)
         
-        copied_files = 0
-        copied_size = 0
-        skipped_files = 0
+        copier = ParallelCopier(self.console, self.format_size, mode=mode)
+        copier.copy(self.copy_jobs(files, target_dir), total)
+        if mode == 'move':
+            self.remove_emptied_folders()
+        return copier
+    
+    def remove_emptied_folders(self):
+        """Delete extraction folders that moving their files left empty"""
+        for result in self.extraction_results['success']:
+            extraction_path = result['extraction_path']
+            if not extraction_path or not os.path.isdir(extraction_path):
+                continue
+            # Bottom-up, so a folder is tried after everything below it
+            for root, dirs, files in os.walk(extraction_path, topdown=False):
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+    
+    def copy_all_files(self, mode='copy'):
+        """Copy all extracted files to a user-specified directory"""
+        target_dir = self.ask_target_dir()
+        if target_dir is None:
+            return False
         
-        for i, file_info in enumerate(self.all_extracted_files, 1):
-            source_path = file_info['path']
-            filename = os.path.basename(source_path)
-            target_path = os.path.join(target_dir, filename)
-            
-            # Handle duplicate filenames
-            counter = 1
-            original_target = target_path
-            while os.path.exists(target_path):
-                name, ext = os.path.splitext(filename)
-                target_path = os.path.join(target_dir, f"{name}_{counter}{ext}")
-                counter += 1
-            
-            try:
-                shutil.copy2(source_path, target_path)
-                copied_files += 1
-                copied_size += file_info['size']
-                print(f"[{i}/{len(self.all_extracted_files)}] ✅ Copied: {filename}")
-            except Exception as e:
-                skipped_files += 1
-                print(f"[{i}/{len(self.all_extracted_files)}] ❌ Failed: {filename} - {e}")
+        total = len(self.all_extracted_files)
+        copier = self.copy_files(self.all_extracted_files, total, target_dir, mode)
         
         # Show copy summary
         print(f"\n{'='*60}")
-        print("COPY SUMMARY")
+        print(f"{mode.upper()} SUMMARY")
         print(f"{'='*60}")
-        print(f"Total files attempted:  {len(self.all_extracted_files)}")
-        print(f"Successfully copied:    {copied_files}")
-        print(f"Failed/Skipped:         {skipped_files}")
-        print(f"Total size copied:      {self.format_size(copied_size)}")
+        print(f"Total files attempted:  {total}")
+        print(f"Successfully {self.MODE_VERBS[mode][1] + ':':<11}{copier.copied_files}")
+        print(f"Failed/Skipped:         {copier.failed_files}")
+        print(f"Total size {self.MODE_VERBS[mode][1] + ':':<13}{self.format_size(copier.copied_size)}")
+        print(f"Throughput:             {self.format_size(copier.bytes_per_second)}/s "
+              f"({copier.elapsed:.1f}s, {copier.workers} threads)")
+        print(f"Copy methods:           {copier.describe_methods()}")
         print(f"Target directory:       {target_dir}")
         print(f"{'='*60}")
         
         return True
     
-    def selective_copy(self):
+    def selective_copy(self, mode='copy'):
         """Let user select which files to copy"""
         print(f"\n📋 Select files to copy ({len(self.all_extracted_files)} files found)")
         print("Enter file numbers separated by commas (e.g., 1,3,5) or 'all' for all files")
         
         # Display files with numbers
         for i, file_info in enumerate(self.all_extracted_files, 1):
-            filename = os.path.basename(file_info['path'])
-            print(f"  {i}. {filename} ({self.format_size(file_info['size'])})")
+            filename = os.path.basename(file_info.path)
+            print(f"  {i}. {filename} ({self.format_size(file_info.size)})")
         
         while True:
             selection = input("\nEnter your selection: ").strip().lower()
@@ -467,54 +2875,25 @@ class ArchiveExtractor:
             print("No files selected for copying.")
             return False
         
-        target_dir = input("\nEnter the target directory path: ").strip()
-        
-        # Validate target directory
-        if not os.path.exists(target_dir):
-            create_dir = input(f"Directory '{target_dir}' doesn't exist. Create it? (y/N): ").strip().lower()
-            if create_dir == 'y':
-                try:
-                    os.makedirs(target_dir, exist_ok=True)
-                    print(f"✅ Created directory: {target_dir}")
-                except OSError as e:
-                    print(f"❌ Failed to create directory: {e}")
-                    return False
-            else:
-                print("Copy operation cancelled.")
-                return False
-        
-        print(f"\n📤 Copying {len(selected_files)} files to: {target_dir}")
-        print("=" * 60)
-        
-        copied_files = 0
-        copied_size = 0
+        target_dir = self.ask_target_dir()
+        if target_dir is None:
+            return False
         
-        for i, file_info in enumerate(selected_files, 1):
-            source_path = file_info['path']
-            filename = os.path.basename(source_path)
-            target_path = os.path.join(target_dir, filename)
-            
-            # Handle duplicate filenames
-            counter = 1
-            original_target = target_path
-            while os.path.exists(target_path):
-                name, ext = os.path.splitext(filename)
-                target_path = os.path.join(target_dir, f"{name}_{counter}{ext}")
-                counter += 1
-            
-            try:
-                shutil.copy2(source_path, target_path)
-                copied_files += 1
-                copied_size += file_info['size']
-                print(f"[{i}/{len(selected_files)}] ✅ Copied: {filename}")
-            except Exception as e:
-                print(f"[{i}/{len(selected_files)}] ❌ Failed: {filename} - {e}")
+        copier = self.copy_files(selected_files, len(selected_files), target_dir, mode)
         
-        print(f"\n✅ Successfully copied {copied_files}/{len(selected_files)} files")
-        print(f"📦 Total size: {self.format_size(copied_size)}")
+        print(f"\n✅ Successfully {self.MODE_VERBS[mode][1]} {copier.copied_files}/{len(selected_files)} files")
+        print(f"📦 Total size: {self.format_size(copier.copied_size)} "
+              f"({self.format_size(copier.bytes_per_second)}/s)")
+        print(f"⚙️  Copy methods: {copier.describe_methods()}")
         
         return True
     
+    def result_name(self, result):
+        """Archive name for reports, noting how many volumes a set had"""
+        name = os.path.basename(result['path'])
+        volumes = result.get('volumes', 1)
+        return f"{name} ({volumes} volumes)" if volumes > 1 else name
+    
     def show_summary(self):
         """Display comprehensive extraction summary"""
         print(f"\n{'='*80}")
@@ -522,11 +2901,11 @@ class ArchiveExtractor:
         print(f"{'='*80}")
         
         print(f"Total archives found:     {self.total_archives}")
-        print(f"Successfully extracted:   {self.successful_extractions}")
-        print(f"Failed extractions:       {self.failed_extractions}")
-        print(f"Password protected:       {self.password_protected}")
+        print(f"Successfully extracted:   {self.successful_extractions.value}")
+        print(f"Failed extractions:       {self.failed_extractions.value}")
+        print(f"Password protected:       {self.password_protected.value}")
         
-        if self.successful_extractions > 0:
+        if self.successful_extractions.value > 0:
             total_archive_size = sum(item['size'] for item in self.extraction_results['success'])
             total_extracted_size = sum(item['extracted_size'] for item in self.extraction_results['success'])
             total_files = sum(item['file_count'] for item in self.extraction_results['success'])
@@ -535,33 +2914,61 @@ class ArchiveExtractor:
             print(f"Total extracted size:     {self.format_size(total_extracted_size)}")
             print(f"Total files extracted:    {total_files}")
         
-        success_rate = (self.successful_extractions / self.total_archives * 100) if self.total_archives > 0 else 0
+        success_rate = (self.successful_extractions.value / self.total_archives * 100) if self.total_archives > 0 else 0
         print(f"Success rate:             {success_rate:.1f}%")
         
         # Show failed extractions if any
         if self.extraction_results['failed']:
-            print(f"\n❌ Failed extractions ({self.failed_extractions}):")
+            print(f"\n❌ Failed extractions ({self.failed_extractions.value}):")
             for failed in self.extraction_results['failed']:
-                print(f"   - {os.path.basename(failed['path'])}: {failed['message']}")
+                print(f"   - {self.result_name(failed)}: {failed['message']}")
         
         # Show successful extractions if any
         if self.extraction_results['success']:
-            print(f"\n✅ Successful extractions ({self.successful_extractions}):")
+            print(f"\n✅ Successful extractions ({self.successful_extractions.value}):")
             for success in self.extraction_results['success']:
                 file_count = success.get('file_count', 0)
-                print(f"   - {os.path.basename(success['path'])} → {file_count} files")
+                print(f"   - {self.result_name(success)} → {file_count} files")
         
         print(f"{'='*80}")
         
-        if self.successful_extractions > 0:
+        if self.successful_extractions.value > 0:
             print("🎉 Extraction completed successfully!")
         else:
             print("ℹ️  No files were extracted.")
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Extract every archive found in the current directory")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Maximum subdirectory depth for recursive scans")
+    parser.add_argument("--follow-symlinks", action="store_true",
+                        help="Descend into symlinked directories (loops are detected)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of archives extracted in parallel (default: CPU count)")
+    parser.add_argument("--sniff-all", action="store_true",
+                        help="Check the header of every file, not just archive and extensionless names")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract archives that earlier runs already processed")
+    parser.add_argument("--index", default=None,
+                        help="Scan index database (default: in the user cache directory)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Neither read nor update the scan index")
+    parser.add_argument("--scan-threads", type=int, default=None,
+                        help="Number of threads used to scan directories")
+    parser.add_argument("--keyring", default=None, metavar="PATH",
+                        help="JSON file of passwords and rules to try on encrypted archives "
+                             "(default: keyring.json in the user cache directory, if present)")
+    parser.add_argument("--manifest", nargs="?", const="", default=None, metavar="PATH",
+                        help="Keep the extracted-file list in a SQLite database instead of memory "
+                             "(default: in the user cache directory)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("📦 Archive File Extractor")
     print("=" * 50)
-    print("Supported formats: ZIP, RAR, 7Z, TAR, GZ, BZ2, XZ")
+    print("Supported formats: ZIP, RAR, 7Z, TAR, GZ, BZ2, XZ, TAR.GZ/TGZ, TAR.BZ2, TAR.XZ, TAR.ZST")
     print(f"Platform: {platform.system()}")
     print("Using: 7-Zip (recommended) + patool (fallback)")
     print("=" * 50)
@@ -570,7 +2977,18 @@ def main():
     current_dir = os.getcwd()
     print(f"Current directory: {current_dir}")
     
-    extractor = ArchiveExtractor()
+    extractor = ArchiveExtractor(
+        max_depth=args.max_depth,
+        follow_symlinks=args.follow_symlinks,
+        scan_workers=args.scan_threads,
+        jobs=args.jobs,
+        sniff_all=args.sniff_all,
+        index_path=args.index,
+        use_index=not args.no_index,
+        force=args.force,
+        manifest_path=args.manifest,
+        keyring_path=args.keyring
+    )
     
     try:
         # Ask for scan mode
@@ -596,6 +3014,8 @@ def main():
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
+    finally:
+        extractor.close()
 
 # Check if required libraries are installed
 def check_dependencies():